@@ -0,0 +1,217 @@
+import asyncio
+import os
+import sys
+import aiohttp
+sys.path.append("..")
+
+from backend.jenkins_operations import JenkinsOperations
+from backend.resilience import clamp_timeout
+from backend.build_tracker import parse_queue_id
+
+class AsyncJenkinsOperations:
+    """asyncio counterpart of JenkinsOperations with bounded concurrent fan-out.
+
+    Configuration (auth, endpoints, timeouts) is shared with JenkinsOperations.
+    Use as an async context manager so the connection pool is closed on exit:
+
+        async with AsyncJenkinsOperations() as jenkins:
+            summaries = await jenkins.get_last_build_summaries(job_names)
+    """
+
+    def __init__(self, jenkins=None, max_concurrency=None):
+        self.jenkins = jenkins or JenkinsOperations()
+        self.max_concurrency = max_concurrency or int(os.getenv("JENKINS_MAX_CONCURRENCY", "20"))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._session = None
+        self._crumb = None
+        self._crumb_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _get_session(self):
+        """Create the aiohttp session lazily (it must be bound to a running loop)."""
+        if self._session is None or self._session.closed:
+            connect_timeout, read_timeout = self.jenkins.timeout
+            self._session = aiohttp.ClientSession(
+                auth=aiohttp.BasicAuth(*self.jenkins.auth),
+                connector=aiohttp.TCPConnector(limit=self.jenkins.pool_size),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def _admit(self):
+        """Per-request timeout clamped to the latency budget, or {"error": ...} when the
+        budget is spent or the circuit breaker shared with JenkinsOperations is open.
+        """
+        # Budget first: allow() may hand out the half-open probe, which must then be recorded
+        timeout = clamp_timeout(self.jenkins.timeout)
+        if timeout is None:
+            return {"error": "Latency budget exhausted for this request."}
+        breaker = self.jenkins.breaker
+        if not breaker.allow():
+            return {"error": f"Jenkins is unavailable, retry in {breaker.retry_after():.0f}s."}
+        connect_timeout, read_timeout = timeout
+        return aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+
+    def _record(self, status):
+        """Feed a response status to the shared circuit breaker (5xx counts as a failure)."""
+        if status < 500:
+            self.jenkins.breaker.record_success()
+        else:
+            self.jenkins.breaker.record_failure()
+
+    async def _get_request(self, url):
+        """Helper function to perform GET requests with error handling."""
+        async with self._semaphore:
+            timeout = self._admit()
+            if isinstance(timeout, dict):
+                return timeout
+            try:
+                async with self._get_session().get(url, timeout=timeout) as response:
+                    self._record(response.status)
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+            except aiohttp.ClientResponseError as e:
+                return {"error": str(e) or type(e).__name__}
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.jenkins.breaker.record_failure()
+                return {"error": str(e) or type(e).__name__}
+
+    async def _get_cached(self, endpoint, **kwargs):
+        """GET an endpoint through the response cache shared with JenkinsOperations."""
+        key = (endpoint, tuple(sorted(kwargs.items())))
+        data = self.jenkins.cache.get(key)
+        if data is not None:
+            return data
+
+        data = await self._get_request(self.jenkins._build_url(endpoint, **kwargs))
+        if "error" not in data:
+            self.jenkins.cache.set(key, data, self.jenkins._ttl_for(endpoint, data), tag=kwargs.get("job_name"))
+        return data
+
+    async def _get_crumb(self, refresh=False):
+        """Return the CSRF crumb header for this client's session, fetched once and reused."""
+        async with self._crumb_lock:
+            if self._crumb is None or refresh:
+                try:
+                    async with self._get_session().get(self.jenkins._build_url("crumb_issuer")) as response:
+                        if response.status == 404:
+                            self._crumb = {}
+                        else:
+                            response.raise_for_status()
+                            data = await response.json(content_type=None)
+                            self._crumb = {data["crumbRequestField"]: data["crumb"]}
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError):
+                    return {}
+            return self._crumb
+
+    async def _post_request(self, url, params={}):
+        """Helper function to perform POST requests with error handling."""
+        async with self._semaphore:
+            timeout = self._admit()
+            if isinstance(timeout, dict):
+                return timeout
+            try:
+                headers = await self._get_crumb()
+                async with self._get_session().post(url, params=params, headers=headers, timeout=timeout) as response:
+                    self._record(response.status)
+                    if response.status == 403 and "crumb" in (await response.text()).lower():
+                        headers = await self._get_crumb(refresh=True)
+                        async with self._get_session().post(url, params=params, headers=headers, timeout=timeout) as retry:
+                            self._record(retry.status)
+                            retry.raise_for_status()
+                            return {"message": "Request successful", "location": retry.headers.get("Location")}
+                    response.raise_for_status()
+                    return {"message": "Request successful", "location": response.headers.get("Location")}
+            except aiohttp.ClientResponseError as e:
+                return {"error": str(e) or type(e).__name__}
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.jenkins.breaker.record_failure()
+                return {"error": str(e) or type(e).__name__}
+
+    async def get_all_jobs(self, user):
+        """List all jobs available for the user."""
+        data = await self._get_cached("jobs_endpoint")
+
+        if "error" in data:
+            return data
+
+        # Filter jobs based on user role; the view is reused until the job list is refetched
+        jobs = self.jenkins.policy.view(user["role"], data, lambda: [job["name"] for job in data.get("jobs", [])])
+
+        return {"jobs": jobs}
+
+    async def trigger_job(self, user, job_name, params={}):
+        """Trigger a Jenkins job (uses buildWithParameters when params are given)."""
+        if not self.jenkins.policy.allows(user["role"], job_name):
+            return {"error": "Access denied"}
+
+        endpoint = "build_with_parameters_endpoint" if params else "build_endpoint"
+        result = await self._post_request(self.jenkins._build_url(endpoint, job_name=job_name), params)
+
+        if "error" not in result:
+            self.jenkins.cache.invalidate(tag=job_name)
+
+            queue_id = parse_queue_id(result.pop("location", None))
+            if queue_id is not None:
+                result["queue_id"] = queue_id
+                self.jenkins.tracker.track(queue_id, job_name)
+        return result
+
+    async def get_last_build_summary(self, job_name):
+        """Retrieve last build summary."""
+        return await self._get_cached("last_build_summary", job_name=job_name)
+
+    async def get_specific_build_summary(self, job_name, build_number):
+        """Retrieve a specific build summary."""
+        return await self._get_cached("specific_build_summary", job_name=job_name, build_number=str(build_number))
+
+    async def get_job_health(self, job_name):
+        """Get job health information."""
+        return await self._get_cached("job_health", job_name=job_name)
+
+    # Bulk variants: one coroutine per item, all in flight at once (bounded by the semaphore)
+
+    async def get_last_build_summaries(self, job_names):
+        """Retrieve last build summaries for many jobs, keyed by job name."""
+        job_names = list(job_names)
+        results = await asyncio.gather(*(self.get_last_build_summary(job) for job in job_names))
+        return dict(zip(job_names, results))
+
+    async def get_specific_build_summaries(self, builds):
+        """Retrieve summaries for (job_name, build_number) pairs, keyed by pair."""
+        builds = list(builds)
+        results = await asyncio.gather(*(self.get_specific_build_summary(job, number) for job, number in builds))
+        return dict(zip(builds, results))
+
+    async def get_job_healths(self, job_names):
+        """Get health information for many jobs, keyed by job name."""
+        job_names = list(job_names)
+        results = await asyncio.gather(*(self.get_job_health(job) for job in job_names))
+        return dict(zip(job_names, results))
+
+    async def trigger_jobs(self, user, job_names, params={}):
+        """Trigger many jobs with the same parameters, keyed by job name."""
+        job_names = list(job_names)
+        results = await asyncio.gather(*(self.trigger_job(user, job, params) for job in job_names))
+        return dict(zip(job_names, results))
+
+
+def run(coro_fn, *args, **kwargs):
+    """Run an AsyncJenkinsOperations method from synchronous (tool) code.
+
+    Example: run(AsyncJenkinsOperations.get_last_build_summaries, ["job-a", "job-b"])
+    """
+    async def _runner():
+        async with AsyncJenkinsOperations() as jenkins:
+            return await coro_fn(jenkins, *args, **kwargs)
+
+    return asyncio.run(_runner())
@@ -1,21 +1,95 @@
 import bcrypt
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
 # from database import get_user
 import sys
 sys.path.append("..")
 
-from backend.auth.database import get_user
+from backend.auth.database import get_user, update_user
+
+# bcrypt cost factor for new hashes; older hashes with a lower cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# bcrypt checks run in this bounded pool, so at most AUTH_WORKERS cores go to logins at
+# once however many sessions log in together. The calling thread still waits for its check.
+_hash_pool = ThreadPoolExecutor(max_workers=int(os.getenv("AUTH_WORKERS", "4")), thread_name_prefix="bcrypt")
+
+# Session tokens: HMAC-SHA256 signed, valid for SESSION_TTL seconds. Without SESSION_SECRET
+# a random key is used, so tokens only survive as long as the process.
+SESSION_TTL = int(os.getenv("SESSION_TTL", "900"))
+_session_secret = (os.getenv("SESSION_SECRET") or secrets.token_hex(32)).encode()
+
+def hash_password(password, rounds=None):
+    """Return the bcrypt hash (str) of a password at the configured cost."""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds or BCRYPT_ROUNDS)).decode()
+
+def _is_bcrypt_hash(value):
+    return value.startswith(("$2a$", "$2b$", "$2y$"))
+
+def _check_password(password, stored):
+    """Compare a password to a stored bcrypt hash (or a legacy plaintext value)."""
+    if _is_bcrypt_hash(stored):
+        return bcrypt.checkpw(password.encode(), stored.encode())
+    return hmac.compare_digest(password.encode(), stored.encode())
+
+def verify_password_async(password, stored):
+    """Queue the password check on the bounded worker pool; returns a Future of bool."""
+    return _hash_pool.submit(_check_password, password, stored)
+
+def _upgrade_hash(username, password, stored):
+    """Store a bcrypt hash at the current cost for legacy plaintext or cheaper hashes."""
+    if _is_bcrypt_hash(stored) and int(stored.split("$")[2]) >= BCRYPT_ROUNDS:
+        return
+    _hash_pool.submit(lambda: update_user(username, {"password": hash_password(password)}))
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def issue_token(username, role, ttl=None):
+    """Issue a signed session token carrying the username, role and expiry."""
+    payload = _b64(json.dumps({"sub": username, "role": role, "exp": int(time.time()) + (ttl or SESSION_TTL)}).encode())
+    signature = _b64(hmac.new(_session_secret, payload.encode(), hashlib.sha256).digest())
+    return f"{payload}.{signature}"
+
+def verify_token(token):
+    """Authorize a request from its session token alone (no database or bcrypt)."""
+    try:
+        payload, signature = token.split(".")
+        expected = _b64(hmac.new(_session_secret, payload.encode(), hashlib.sha256).digest())
+        if not hmac.compare_digest(signature, expected):
+            return {"status": "failed", "message": "Invalid session"}
+        claims = json.loads(_unb64(payload))
+    except (AttributeError, ValueError):
+        return {"status": "failed", "message": "Invalid session"}
+
+    if claims["exp"] < time.time():
+        return {"status": "failed", "message": "Session expired, please log in again"}
+    return {"status": "success", "username": claims["sub"], "role": claims["role"]}
 
 def authenticate(username, password):
-    """Authenticate user and return role-based access."""
+    """Authenticate user and return role-based access with a session token.
+
+    Blocks the caller for one bcrypt check; afterwards each request is authorized
+    with verify_token() instead, without bcrypt or a database round-trip.
+    """
     user = get_user(username)
-    print(user)
-    
+
     if not user:
         return {"status": "failed", "message": "User not found"}
 
     hashed_password = user["password"]
-    
-    if password == hashed_password:
-        return {"status": "success", "role": user["role"]}
-    
-    return {"status": "failed", "message": "Invalid credentials"}
\ No newline at end of file
+
+    if verify_password_async(password, hashed_password).result():
+        _upgrade_hash(username, password, hashed_password)
+        return {"status": "success", "role": user["role"], "token": issue_token(username, user["role"])}
+
+    return {"status": "failed", "message": "Invalid credentials"}
@@ -1,17 +1,101 @@
 from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+import logging
 import os
+import sys
+import threading
 from dotenv import load_dotenv
+sys.path.append("..")
+
+from backend.ttl_cache import TTLCache
 
 load_dotenv("../config/auth.env")
 
 MONGO_URI = os.getenv("MONGO_URI")
-DB_NAME = "jenkins_ai"
+DB_NAME = os.getenv("MONGO_DB", "jenkins_ai")
+
+# Pool settings for the shared client
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "10"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", "5000"))
+
+# User records are read on every login; keep them for USER_CACHE_TTL seconds
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))
+user_cache = TTLCache(max_size=int(os.getenv("USER_CACHE_SIZE", "1024")))
+
+_client = None
+_users_collection = None
+_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+def set_client(client):
+    """Use the given client (e.g. a mongomock.MongoClient in tests) instead of connecting to MONGO_URI."""
+    global _client, _users_collection
+    with _lock:
+        _client = client
+        _users_collection = None
+    user_cache.clear()
+
+def get_client():
+    """Return the shared pooled MongoClient, created on first use rather than at import."""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = MongoClient(
+                MONGO_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+                connectTimeoutMS=MONGO_TIMEOUT_MS,
+            )
+        return _client
 
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
-users_collection = db["users"]
+def get_users_collection():
+    """Return the users collection, making sure `username` is indexed the first time.
+
+    The index is best effort: existing duplicate usernames or a role without
+    createIndex rights only log a warning, and the attempt is not repeated.
+    """
+    global _users_collection
+    client = get_client()
+    with _lock:
+        if _users_collection is None:
+            collection = client[DB_NAME]["users"]
+            try:
+                collection.create_index("username", unique=True)
+            except PyMongoError as e:
+                logger.warning("Could not create the unique username index on %s.users: %s", DB_NAME, e)
+            _users_collection = collection
+        return _users_collection
 
 def get_user(username):
-    """Retrieve user details from MongoDB."""
-    user = users_collection.find_one({"username": username}, {"_id": 0})  # Exclude `_id`
-    return user if user else None
\ No newline at end of file
+    """Retrieve user details, from the user cache or MongoDB."""
+    user = user_cache.get(username)
+    if user is None:
+        user = get_users_collection().find_one({"username": username}, {"_id": 0})  # Exclude `_id`
+        if not user:
+            return None
+        user_cache.set(username, user, USER_CACHE_TTL)
+    return dict(user)
+
+def invalidate_user(username=None):
+    """Drop one cached user record, or all of them when username is None.
+
+    Call this whenever a user is changed outside update_user/delete_user.
+    """
+    if username is None:
+        user_cache.clear()
+    else:
+        user_cache.invalidate(key=username)
+
+def update_user(username, fields, upsert=False):
+    """Update (or with upsert, create) a user record and drop its cached copy."""
+    result = get_users_collection().update_one({"username": username}, {"$set": fields}, upsert=upsert)
+    invalidate_user(username)
+    return result.matched_count > 0 or result.upserted_id is not None
+
+def delete_user(username):
+    """Delete a user record and drop its cached copy."""
+    result = get_users_collection().delete_one({"username": username})
+    invalidate_user(username)
+    return result.deleted_count > 0
@@ -0,0 +1,56 @@
+import numpy as np
+
+def compute_health(builds, recent=10):
+    """Health metrics over a build history, computed with vectorized numpy operations.
+
+    `builds` are dicts with number, result, duration (ms) and timestamp (ms), in any
+    order. Builds still running (result None) are ignored.
+    """
+    completed = [build for build in builds if build.get("result") is not None]
+    if not completed:
+        return {"builds": 0}
+
+    completed.sort(key=lambda build: build["number"])
+    results = np.array([build["result"] for build in completed])
+    durations = np.array([build.get("duration") or 0 for build in completed], dtype=float) / 1000
+    success = results == "SUCCESS"
+
+    # Flakiness: how often the outcome flips between consecutive builds
+    flips = np.count_nonzero(success[1:] != success[:-1])
+    flakiness = flips / (len(success) - 1) if len(success) > 1 else 0.0
+
+    labels, counts = np.unique(results, return_counts=True)
+    p50, p95 = np.percentile(durations, [50, 95])
+
+    # Trends: recent success rate vs. overall, and duration slope in seconds per build
+    recent_success = success[-recent:].mean()
+    duration_slope = np.polyfit(np.arange(len(durations)), durations, 1)[0] if len(durations) > 1 else 0.0
+
+    return {
+        "builds": len(completed),
+        "first_build": completed[0]["number"],
+        "last_build": completed[-1]["number"],
+        "success_rate": float(success.mean()),
+        "recent_success_rate": float(recent_success),
+        "flakiness": float(flakiness),
+        "p50_duration_s": float(p50),
+        "p95_duration_s": float(p95),
+        "duration_trend_s_per_build": float(duration_slope),
+        "results": {str(label): int(count) for label, count in zip(labels, counts)},
+    }
+
+def format_health(job_name, health):
+    """One-paragraph text rendering of compute_health() output for the agent."""
+    if not health["builds"]:
+        return f"Job '{job_name}' has no completed builds."
+    trend = "stable"
+    if health["recent_success_rate"] > health["success_rate"] + 0.1:
+        trend = "improving"
+    elif health["recent_success_rate"] < health["success_rate"] - 0.1:
+        trend = "degrading"
+    return (
+        f"Job '{job_name}' over {health['builds']} builds (#{health['first_build']}-#{health['last_build']}): "
+        f"success rate {health['success_rate']:.0%} ({trend}, last builds {health['recent_success_rate']:.0%}), "
+        f"flakiness {health['flakiness']:.0%}, duration p50 {health['p50_duration_s']:.0f}s / "
+        f"p95 {health['p95_duration_s']:.0f}s ({health['duration_trend_s_per_build']:+.1f}s per build)."
+    )
@@ -0,0 +1,111 @@
+import sqlite3
+import threading
+
+BUILD_FIELDS = ("number", "result", "url", "building", "timestamp", "duration")
+
+class BuildStore:
+    """Local SQLite copy of per-job build records.
+
+    Finished builds never change in Jenkins, so once stored they are served
+    locally forever; only builds newer than the sync point are ever fetched again.
+    The sync point is an explicit per-job watermark moved only by a completed sync,
+    never derived from the stored rows: single builds stored from lookups or pushed
+    events may sit above gaps that a sync still has to fill.
+    One connection is shared across threads behind a lock.
+    """
+
+    def __init__(self, path="build_history.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS builds (
+                    job TEXT NOT NULL,
+                    number INTEGER NOT NULL,
+                    result TEXT,
+                    url TEXT,
+                    building INTEGER NOT NULL DEFAULT 0,
+                    timestamp INTEGER,
+                    duration INTEGER,
+                    PRIMARY KEY (job, number)
+                ) WITHOUT ROWID"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS sync_state (
+                    job TEXT PRIMARY KEY,
+                    synced_to INTEGER NOT NULL
+                )"""
+            )
+
+    def upsert(self, job_name, builds, sync_point=None):
+        """Insert or refresh build records (dicts with BUILD_FIELDS) for a job.
+
+        Only a history sync passes `sync_point`, the build number up to which every
+        build of the job is now stored as finished; it is saved with the rows.
+        """
+        rows = [
+            (job_name, build["number"], build.get("result"), build.get("url"), int(bool(build.get("building"))),
+             build.get("timestamp"), build.get("duration"))
+            for build in builds if build.get("number") is not None
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO builds (job, number, result, url, building, timestamp, duration) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if sync_point is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (job, synced_to) VALUES (?, ?)", (job_name, int(sync_point))
+                )
+
+    def sync_point(self, job_name):
+        """Build number up to which the job's history has been synced (0 if never).
+
+        Builds above this number are new, were still running at the last sync, or
+        were stored one at a time, so a sync refetches them.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT synced_to FROM sync_state WHERE job = ?", (job_name,)).fetchone()
+        return row[0] if row else 0
+
+    def get(self, job_name, build_number):
+        """A stored build as a summary dict, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM builds WHERE job = ? AND number = ?", (job_name, int(build_number))
+            ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def history(self, job_name, limit=100, result=None, since=None):
+        """Most recent stored builds of a job, newest first.
+
+        Optionally only builds with the given result, or started at/after `since` (epoch ms).
+        """
+        query, args = "SELECT * FROM builds WHERE job = ?", [job_name]
+        if result:
+            query += " AND result = ?"
+            args.append(result.upper())
+        if since is not None:
+            query += " AND timestamp >= ?"
+            args.append(int(since))
+        query += " ORDER BY number DESC LIMIT ?"
+        args.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def delete(self, job_name):
+        """Forget every stored build of a job (e.g. after it was deleted or renamed)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM builds WHERE job = ?", (job_name,))
+            self._conn.execute("DELETE FROM sync_state WHERE job = ?", (job_name,))
+
+    @staticmethod
+    def _to_dict(row):
+        build = {field: row[field] for field in BUILD_FIELDS}
+        build["building"] = bool(build["building"])
+        return build
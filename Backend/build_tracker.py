@@ -0,0 +1,178 @@
+import re
+import threading
+import time
+
+_QUEUE_ID = re.compile(r"/queue/item/(\d+)")
+
+def parse_queue_id(location):
+    """Extract the queue item id from a trigger response's Location header."""
+    match = _QUEUE_ID.search(location or "")
+    return int(match.group(1)) if match else None
+
+class BuildHandle:
+    """A triggered build, followed from its queue item to a finished build."""
+
+    def __init__(self, queue_id, job_name):
+        self.queue_id = queue_id
+        self.job_name = job_name
+        self.state = "queued"  # queued -> running -> completed (or unknown)
+        self.build_number = None
+        self.result = None
+        self.url = None
+        self.created = self.updated = time.monotonic()
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the build completes; returns True if it did within timeout."""
+        return self._done.wait(timeout)
+
+    def to_dict(self):
+        return {
+            "queue_id": self.queue_id,
+            "job_name": self.job_name,
+            "state": self.state,
+            "build_number": self.build_number,
+            "result": self.result,
+            "url": self.url,
+        }
+
+class BuildTracker:
+    """Follows triggered builds with one shared background poller.
+
+    Each round costs one queue request plus one builds request per distinct job
+    with outstanding handles, however many handles there are. That request covers
+    the newest `window` builds plus one per outstanding handle; a handle whose
+    build is still not in it (e.g. after a large fan-out) is resolved through its
+    queue item's executable, then by build number. The interval backs
+    off while nothing changes and resets when a handle moves or a new one arrives.
+    With push_enabled (a notification receiver is running) builds advance through
+    notify() and polling only runs at max_interval as a safety net for lost events.
+    """
+
+    def __init__(self, jenkins, min_interval=2, max_interval=30, max_age=3600, window=20):
+        self.jenkins = jenkins
+        self.window = window
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_age = max_age
+        self._handles = {}  # queue_id -> BuildHandle (outstanding only)
+        self._latest = {}  # job_name -> most recent BuildHandle
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.push_enabled = False
+
+    def track(self, queue_id, job_name):
+        """Start following a queue item; returns its BuildHandle."""
+        handle = BuildHandle(queue_id, job_name)
+        with self._lock:
+            self._handles[queue_id] = handle
+            self._latest[job_name] = handle
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="jenkins-build-tracker", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return handle
+
+    def latest(self, job_name):
+        """The most recently triggered handle for a job, if any."""
+        with self._lock:
+            return self._latest.get(job_name)
+
+    def _run(self):
+        interval = self.min_interval
+        while True:
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            with self._lock:
+                outstanding = list(self._handles.values())
+                if not outstanding:
+                    self._thread = None
+                    return
+            if self.push_enabled:
+                interval = self.max_interval
+                # Only poll handles that no event has touched for a whole interval
+                stale = [handle for handle in outstanding if time.monotonic() - handle.updated >= self.max_interval]
+                self.poll(stale)
+                continue
+            changed = self.poll(outstanding)
+            interval = self.min_interval if changed else min(interval * 2, self.max_interval)
+
+    def poll(self, handles):
+        """Advance the given handles with batched requests; returns True if any changed."""
+        changed = False
+        queued = {handle.queue_id for handle in handles if handle.state == "queued"}
+        if queued:
+            data = self.jenkins._get_request(self.jenkins._build_url("queue_items"))
+            if "error" not in data:
+                still_queued = {item["id"] for item in data.get("items", [])}
+                queued &= still_queued
+
+        by_job = {}
+        for handle in handles:
+            if handle.queue_id not in queued:
+                by_job.setdefault(handle.job_name, []).append(handle)
+
+        fields = self.jenkins.endpoints["projections"]["job_builds"]
+        for job_name, job_handles in by_job.items():
+            tree = f"{fields}{{0,{self.window + len(job_handles)}}}"
+            data = self.jenkins._get_request(self.jenkins._build_url("job_builds", job_name=job_name, tree=tree))
+            if "error" in data:
+                continue
+            builds = {build.get("queueId"): build for build in data.get("builds", [])}
+            for handle in job_handles:
+                build = builds.get(handle.queue_id) or self._lookup(handle)
+                if build is None:
+                    if time.monotonic() - handle.created > self.max_age:
+                        changed |= self._finish(handle, "unknown")
+                    continue
+                changed |= self._update(handle, build)
+
+        return changed
+
+    def _lookup(self, handle):
+        """Fetch a handle's build directly when it fell outside the builds window."""
+        number = handle.build_number
+        if number is None:
+            item = self.jenkins._get_request(self.jenkins._build_url("queue_item", queue_id=handle.queue_id))
+            number = (item.get("executable") or {}).get("number")
+            if number is None:
+                return None  # not started yet, or the queue item has expired
+        build = self.jenkins._get_request(
+            self.jenkins._build_url("specific_build_summary", job_name=handle.job_name, build_number=number)
+        )
+        return None if "error" in build else build
+
+    def notify(self, job_name, build):
+        """Apply a pushed build update (with queueId) to the matching handle, if tracked."""
+        with self._lock:
+            handle = self._handles.get(build.get("queueId"))
+        if handle is None or handle.job_name != job_name:
+            return False
+        return self._update(handle, build)
+
+    def _update(self, handle, build):
+        state = "running" if build.get("building") else "completed"
+        if state == handle.state and build.get("number") == handle.build_number:
+            return False
+        handle.build_number = build.get("number")
+        handle.url = build.get("url")
+        handle.result = build.get("result")
+        handle.updated = time.monotonic()
+        if state == "completed":
+            return self._finish(handle, state)
+        handle.state = state
+        return True
+
+    def _finish(self, handle, state):
+        handle.state = state
+        with self._lock:
+            self._handles.pop(handle.queue_id, None)
+        # A finished build changes lastBuild, health and history for the job
+        self.jenkins.cache.invalidate(tag=handle.job_name)
+        handle._done.set()
+        return True
@@ -0,0 +1,67 @@
+import contextvars
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class RateLimiter:
+    """Thread-safe token bucket: `rate` acquisitions per second with bursts up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+def expand_matrix(matrix):
+    """Expand {"ENV": ["dev", "prod"], "ARCH": ["x86", "arm"]} into every parameter combination."""
+    if not matrix:
+        return [{}]
+    keys = list(matrix)
+    return [dict(zip(keys, values)) for values in itertools.product(*(matrix[key] for key in keys))]
+
+class BulkTrigger:
+    """Fires many trigger_job calls concurrently under a rate limit and concurrency cap."""
+
+    def __init__(self, jenkins, rate=5, max_workers=4):
+        self.jenkins = jenkins
+        self.limiter = RateLimiter(rate, burst=max_workers)
+        self.max_workers = max_workers
+
+    def _trigger(self, user, job_name, params):
+        self.limiter.acquire()
+        result = self.jenkins.trigger_job(user, job_name, params)
+        outcome = {"job": job_name, "params": params}
+        if "error" in result:
+            outcome.update(status="failed", error=result["error"])
+        else:
+            outcome.update(status="triggered", queue_id=result.get("queue_id"))
+        return outcome
+
+    def run(self, user, job_names, params=None, matrix=None):
+        """Trigger every job once per matrix combination (merged over `params`).
+
+        Returns one outcome dict per trigger, in input order.
+        """
+        items = [
+            (job_name, {**(params or {}), **combination})
+            for job_name in job_names
+            for combination in expand_matrix(matrix)
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, self._trigger, user, *item) for item in items]
+            return [future.result() for future in futures]
@@ -0,0 +1,120 @@
+import re
+import threading
+
+_JOB = r"(?P<job>[\w./-]+)"
+_BUILD = r"(?:#|no\.? ?|number )?(?P<build>\d+)"
+_OF = r"(?:of|for|on)(?: the)?(?: job)?"
+
+# Words the job capture can pick up from loose phrasings ("is my build done", "why did it
+# fail"); a match whose job is one of these is not a job name and falls back to the agent.
+JOB_STOP_WORDS = frozenset({
+    "it", "its", "this", "that", "these", "those", "them", "they", "one", "mine", "my", "our",
+    "me", "us", "you", "i", "we", "the", "a", "an", "build", "builds", "job", "jobs", "pipeline",
+    "last", "latest", "previous", "current", "same", "again", "everything", "all", "something",
+    "what", "which", "now", "please", "then", "also", "too", "here", "there", "show", "get",
+    "run", "start", "trigger", "status", "summary", "result", "number", "of", "for", "on",
+})
+
+# Phrasings that fully determine a tool call. A query is routed only when one of these
+# matches it from start to end; anything else goes to the LLM agent.
+INTENT_PATTERNS = {
+    "list_jobs": [
+        r"(?:list|show|get)(?: me)?(?: all)?(?: the)?(?: available)?(?: jenkins)? jobs",
+        r"what jobs (?:are there|do (?:i|we) have|are available)",
+    ],
+    "show_more": [r"(?:show )?more(?: jobs)?", r"next(?: page)?"],
+    "specific_build": [
+        rf"(?:get |show )?(?:the )?build summary {_OF} {_JOB} with build number (?P<build>\d+)",
+        rf"(?:get |show |what is |what's )?(?:the )?(?:summary|status|result)? ?{_OF}? ?build {_BUILD} {_OF} {_JOB}",
+        rf"(?:get |show )?{_JOB} build {_BUILD}",
+    ],
+    "last_build": [
+        rf"(?:get |show |what is |what's )?(?:the )?last build(?: summary| status| result)? {_OF} {_JOB}",
+        rf"how did(?: the)? last build {_OF} {_JOB} go",
+    ],
+    "health": [
+        rf"(?:get |show |check |what is |what's )?(?:the )?(?:job )?health {_OF} {_JOB}",
+        rf"how healthy is(?: the job)? {_JOB}",
+        rf"is {_JOB} (?:healthy|flaky)",
+    ],
+    "failing_jobs": [
+        r"(?:which|what|list|show)(?: the)?(?: jobs)? (?:are )?(?:failing|broken|red)(?: jobs)?",
+        r"(?:list|show)(?: me)?(?: all)?(?: the)? failing jobs",
+    ],
+    "build_status": [
+        rf"is (?:my |the )?(?:build|job)? ?(?:of |for )?{_JOB} (?:done|finished|complete|still running)",
+        rf"(?:what is |what's )?(?:the )?status of (?:my |the )?triggered build {_OF} {_JOB}",
+    ],
+    "explain_failure": [
+        rf"why did(?: the)?(?: last build of)? {_JOB} fail",
+        rf"(?:explain|analy[sz]e)(?: the)?(?: last)? (?:build )?failure {_OF} {_JOB}",
+    ],
+    "test_report": [rf"(?:get |show )?(?:the )?(?:failing )?tests? (?:report|results|failures) {_OF} {_JOB}"],
+    "build_history": [rf"(?:get |show )?(?:the )?(?:recent )?(?:build history|builds) {_OF} {_JOB}"],
+    "artifacts": [rf"(?:list |get |show )?(?:the )?artifacts {_OF} {_JOB}"],
+    # Triggers change Jenkins, so only the explicit "<verb> job X" form is routed
+    "trigger": [rf"(?:trigger|run|start|kick off)(?: the)? job {_JOB}(?: now)?"],
+}
+
+def normalize_query(query):
+    """Collapse whitespace and drop trailing punctuation; case is kept for job names."""
+    return re.sub(r"\s+", " ", query).strip().rstrip("?.!").strip()
+
+class IntentRouter:
+    """Deterministic fast path in front of the LLM agent.
+
+    Patterns are compiled once at construction and must match the whole normalized
+    query, so partial or ambiguous phrasings fall back to the agent. `handlers` maps
+    intent names to callables taking the captured arguments (job, build) as keywords;
+    intents without a handler are never routed. A handler may return None to decline.
+    `resolve_job` maps a captured job name to the real one, or None when it does not
+    name a job exactly; such queries are declined before any handler runs.
+    """
+
+    def __init__(self, handlers, patterns=None, resolve_job=None):
+        self.handlers = handlers
+        self.resolve_job = resolve_job
+        self._intents = [
+            (name, [re.compile(pattern, re.IGNORECASE) for pattern in rules])
+            for name, rules in (patterns or INTENT_PATTERNS).items()
+            if name in handlers
+        ]
+        self.hits = {}
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def classify(self, query):
+        """Return (intent, arguments) for a query that matches an intent fully, else None."""
+        text = normalize_query(query)
+        for name, patterns in self._intents:
+            for pattern in patterns:
+                match = pattern.fullmatch(text)
+                if match and (match.groupdict().get("job") or "").lower() not in JOB_STOP_WORDS:
+                    return name, match.groupdict()
+        return None
+
+    def route(self, query):
+        """Answer a query by calling its tool directly; returns None when the agent should handle it."""
+        intent = self.classify(query)
+        if intent and intent[1].get("job") and self.resolve_job:
+            job_name = self.resolve_job(intent[1]["job"])
+            intent = (intent[0], {**intent[1], "job": job_name}) if job_name else None
+        response = self.handlers[intent[0]](**intent[1]) if intent else None
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits[intent[0]] = self.hits.get(intent[0], 0) + 1
+        return response
+
+    def stats(self):
+        """Routed/fallback counts, the hit rate and hits per intent."""
+        with self._lock:
+            routed = sum(self.hits.values())
+            total = routed + self.misses
+            return {
+                "routed": routed,
+                "fallback": self.misses,
+                "hit_rate": routed / total if total else 0.0,
+                "by_intent": dict(self.hits),
+            }
@@ -1,11 +1,61 @@
 import requests
+import codecs
+import hashlib
 import os
 import json
+import sys
+import threading
+import time
+from urllib.parse import quote
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+sys.path.append("..")
+
+from backend.ttl_cache import TTLCache
+from backend.job_crawler import JobCrawler
+from backend.job_index import JobIndex
+from backend.job_policy import JobPolicy, DEFAULT_ROLE
+from backend.log_analysis import FailureScanner, format_excerpts
+from backend.test_report import parse_test_report, format_test_report
+from backend.build_tracker import BuildTracker, parse_queue_id
+from backend.bulk_trigger import BulkTrigger
+from backend.build_analytics import compute_health
+from backend.build_store import BuildStore
+from backend.notification_receiver import NotificationReceiver
+from backend.response_cache import ResponseCache, note_read, note_session, note_write
+from backend.resilience import CircuitBreaker, latency_budget, clamp_timeout, backoff_delay, remaining_budget
 
 load_dotenv("./config/auth.env")
 
 class JenkinsOperations:
+    # One pooled keep-alive session shared by every instance in the process
+    _session = None
+    _session_lock = threading.Lock()
+    # Response cache shared the same way, so a trigger from any instance invalidates it
+    _cache = None
+    # Local job-name index used to resolve misspelled names without a round-trip
+    _job_index = JobIndex()
+    _job_index_lock = threading.Lock()
+    _job_index_refreshed = None
+    _job_index_refreshing = False
+    # Single background poller following every triggered build
+    _tracker = None
+    # CSRF crumb header for the pooled session (crumbs are bound to its session cookie)
+    _crumb = None
+    _crumb_lock = threading.Lock()
+    # One breaker for the controller: when it is down every call fails fast
+    _breaker = None
+    # Local SQLite copy of build history, synced incrementally
+    _store = None
+    # Local HTTP receiver for notification-plugin build events
+    _receiver = None
+    # Role-based job visibility rules, compiled once from config/roles.json
+    _policy = None
+    # Agent answers reused while the Jenkins state they read is unchanged
+    _response_cache = None
+    # (snapshot response, {job: (last build number, color)}) for the newest status snapshot seen
+    _snapshot_states = None
+
     def __init__(self):
         self.base_url = os.getenv("JENKINS_URL", "http://10.70.46.85:8080/")
         self.auth_user = os.getenv("JENKINS_USER")
@@ -16,65 +66,847 @@ class JenkinsOperations:
         
         self.auth = (self.auth_user, self.auth_token)
 
+        # Connection pool and timeout settings (seconds)
+        self.pool_size = int(os.getenv("JENKINS_POOL_SIZE", "10"))
+        self.timeout = (
+            float(os.getenv("JENKINS_CONNECT_TIMEOUT", "5")),
+            float(os.getenv("JENKINS_READ_TIMEOUT", "30")),
+        )
+        self.session = self._get_session(self.pool_size)
+
+        # Resilience settings: GET retries, circuit breaker and per-turn latency budget
+        self.retries = int(os.getenv("JENKINS_RETRIES", "2"))
+        self.turn_budget = float(os.getenv("JENKINS_TURN_BUDGET", "60"))
+        self.breaker = self._get_breaker(
+            int(os.getenv("JENKINS_BREAKER_THRESHOLD", "5")),
+            float(os.getenv("JENKINS_BREAKER_RESET", "30")),
+        )
+
         base_dir = os.path.dirname(os.path.abspath(__file__))  # Gets the directory of the current script
         file_path = os.path.join(base_dir, "config", "endpoints.json")
         with open(file_path, "r") as f:
             self.endpoints = json.load(f)
 
+        self.cache_ttl = self.endpoints.get("cache_ttl", {})
+        self.policy = self._get_policy(os.getenv("JENKINS_ROLES_FILE", os.path.join(base_dir, "config", "roles.json")))
+        self.cache = self._get_cache(int(os.getenv("JENKINS_CACHE_SIZE", "512")))
+        self.job_index = self._job_index
+        self.job_index_ttl = float(os.getenv("JENKINS_JOB_INDEX_TTL", "300"))
+
+        # Build-history store: where it lives, how many builds a sync requests at a time,
+        # and how far back the first sync of a job goes
+        self.history_db = os.getenv("JENKINS_HISTORY_DB", os.path.join(base_dir, "build_history.db"))
+        self.history_page_size = int(os.getenv("JENKINS_HISTORY_PAGE_SIZE", "50"))
+        self.history_limit = int(os.getenv("JENKINS_HISTORY_LIMIT", "1000"))
+
+        # Where downloaded artifacts are written
+        self.download_dir = os.getenv("JENKINS_DOWNLOAD_DIR", os.path.join(base_dir, "downloads"))
+
+    @classmethod
+    def _get_session(cls, pool_size):
+        """Return the shared pooled session, creating it on first use."""
+        with cls._session_lock:
+            if cls._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"Connection": "keep-alive"})
+                cls._session = session
+            return cls._session
+
+    @classmethod
+    def _get_breaker(cls, failure_threshold, reset_timeout):
+        """Return the shared circuit breaker, creating it on first use."""
+        with cls._session_lock:
+            if cls._breaker is None:
+                cls._breaker = CircuitBreaker(failure_threshold, reset_timeout)
+            return cls._breaker
+
+    def latency_budget(self, seconds=None):
+        """Context manager bounding the Jenkins time spent on one user turn (JENKINS_TURN_BUDGET)."""
+        return latency_budget(seconds if seconds is not None else self.turn_budget)
+
+    @classmethod
+    def _get_cache(cls, max_size):
+        """Return the shared response cache, creating it on first use."""
+        with cls._session_lock:
+            if cls._cache is None:
+                cls._cache = TTLCache(max_size=max_size)
+            return cls._cache
+
+    @classmethod
+    def _get_policy(cls, path):
+        """Return the shared job visibility policy, compiling it on first use."""
+        with cls._session_lock:
+            if cls._policy is None:
+                cls._policy = JobPolicy.from_file(path)
+            return cls._policy
+
+    @property
+    def tracker(self):
+        """The shared BuildTracker, created on first use."""
+        cls = type(self)
+        with cls._session_lock:
+            if cls._tracker is None:
+                cls._tracker = BuildTracker(
+                    self,
+                    min_interval=float(os.getenv("JENKINS_POLL_MIN_INTERVAL", "2")),
+                    max_interval=float(os.getenv("JENKINS_POLL_MAX_INTERVAL", "30")),
+                )
+            return cls._tracker
+
+    @property
+    def response_cache(self):
+        """The shared ResponseCache for agent answers, created on first use."""
+        cls = type(self)
+        with cls._session_lock:
+            if cls._response_cache is None:
+                cls._response_cache = ResponseCache(
+                    self.state_fingerprint,
+                    max_size=int(os.getenv("RESPONSE_CACHE_SIZE", "256")),
+                    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+                )
+            return cls._response_cache
+
+    def _job_states(self):
+        """Last build number and color of every top-level job, from the cached status snapshot.
+
+        When a new snapshot shows that a job changed, that job's cached responses are
+        dropped, so an answer can never combine pre-build data with a fingerprint taken
+        after the build. Returns None when the snapshot is unavailable.
+        """
+        snapshot = self._get_cached("status_snapshot")
+        if "error" in snapshot:
+            return None
+        cls = type(self)
+        with cls._session_lock:
+            seen = cls._snapshot_states
+        if seen is not None and seen[0] is snapshot:
+            return seen[1]
+
+        states = {
+            job["name"]: ((job.get("lastBuild") or {}).get("number"), job.get("color"))
+            for job in snapshot.get("jobs", [])
+        }
+        if seen is not None:
+            for job_name, state in states.items():
+                if seen[1].get(job_name, state) != state:
+                    self.cache.invalidate(tag=job_name)
+        with cls._session_lock:
+            cls._snapshot_states = (snapshot, states)
+        return states
+
+    def state_fingerprint(self, dependencies):
+        """Summarize the current state of the jobs an answer depended on; None if unavailable.
+
+        Top-level jobs come from one status snapshot (last build number and color, which
+        changes while a build runs); jobs inside folders use their last build summary.
+        dependencies=None summarizes every top-level job.
+        """
+        states = self._job_states()
+        if states is None:
+            return None
+        if dependencies is None or dependencies.global_state:
+            return tuple(sorted(states.items(), key=lambda item: item[0]))
+
+        fingerprint = []
+        for job_name in sorted(dependencies.jobs):
+            if job_name in states:
+                fingerprint.append((job_name, states[job_name]))
+                continue
+            summary = self.get_last_build_summary(job_name)
+            if "error" in summary and "404" not in summary["error"]:
+                return None
+            fingerprint.append((job_name, (summary.get("number"), summary.get("building"), summary.get("result"))))
+        return tuple(fingerprint)
+
+    @property
+    def store(self):
+        """The shared BuildStore, opened on first use."""
+        cls = type(self)
+        with cls._session_lock:
+            if cls._store is None:
+                cls._store = BuildStore(self.history_db)
+            return cls._store
+
+    def _build_url(self, endpoint, tree=None, **kwargs):
+        """Build a full URL from an endpoint template in endpoints.json.
+
+        Job names may be full paths ("folder/sub/job"); each segment is nested as
+        /job/<segment>. API endpoints get a `tree=` filter so Jenkins only serializes
+        the fields we read: the projection declared for the endpoint, or an explicit
+        `tree` override.
+        """
+        if "job_name" in kwargs:
+            kwargs["job_name"] = "/job/".join(quote(part, safe="") for part in str(kwargs["job_name"]).split("/"))
+        url = f"{self.base_url.rstrip('/')}{self.endpoints[endpoint].format(**kwargs)}"
+
+        tree = tree or self.endpoints.get("projections", {}).get(endpoint)
+        if tree:
+            url += f"{'&' if '?' in url else '?'}tree={tree}"
+        return url
+
+    def _guarded_get(self, url, **kwargs):
+        """GET a URL within the circuit breaker and the current latency budget.
+
+        GETs are idempotent, so connection errors, timeouts and 5xx responses are retried
+        with jittered backoff. Returns the response (the caller closes it; pass
+        stream=True to read large bodies incrementally) or {"error": ...}. 4xx responses
+        are returned as-is: the controller is healthy, only the request is wrong.
+        """
+        error = None
+        for attempt in range(self.retries + 1):
+            # Budget first: allow() may hand out the half-open probe, which must then be recorded
+            timeout = clamp_timeout(self.timeout)
+            if timeout is None:
+                return {"error": error or "Latency budget exhausted for this request."}
+            if not self.breaker.allow():
+                return {"error": f"Jenkins is unavailable, retry in {self.breaker.retry_after():.0f}s."}
+
+            try:
+                response = self.session.get(url, auth=self.auth, timeout=timeout, **kwargs)
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                    return response
+                response.close()
+                response.raise_for_status()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.HTTPError) as e:
+                self.breaker.record_failure()
+                error = str(e)
+            except requests.exceptions.RequestException as e:
+                # Broken or undecodable response: count it so a half-open probe is resolved
+                self.breaker.record_failure()
+                return {"error": str(e)}
+
+            if attempt < self.retries:
+                delay = backoff_delay(attempt)
+                budget = remaining_budget()
+                if budget is not None and delay >= budget:
+                    break
+                time.sleep(delay)
+
+        return {"error": error}
+
     def _get_request(self, url):
-        """Helper function to perform GET requests with error handling."""
-        try:
-            response = requests.get(url, auth=self.auth)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e)}
+        """Helper function to perform GET requests with error handling (see _guarded_get)."""
+        response = self._guarded_get(url)
+        if isinstance(response, dict):
+            return response
+        with response:
+            try:
+                response.raise_for_status()
+                return response.json()
+            except requests.exceptions.RequestException as e:
+                return {"error": str(e)}
+
+    def _get_cached(self, endpoint, **kwargs):
+        """GET an endpoint through the response cache, keyed on endpoint + params.
+
+        Errors are never cached; builds still in progress use the short "building" TTL.
+        """
+        note_read(kwargs.get("job_name"))
+        key = self._cache_key(endpoint, **kwargs)
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        data = self._get_request(self._build_url(endpoint, **kwargs))
+        if "error" not in data:
+            self.cache.set(key, data, self._ttl_for(endpoint, data), tag=kwargs.get("job_name"))
+        return data
+
+    @staticmethod
+    def _cache_key(endpoint, **kwargs):
+        return (endpoint, tuple(sorted(kwargs.items())))
+
+    def _ttl_for(self, endpoint, data):
+        """Pick the cache TTL (seconds) for a response from the given endpoint."""
+        ttl = self.cache_ttl.get(endpoint, 0)
+        if data.get("building"):
+            ttl = min(ttl, self.cache_ttl.get("building", 0))
+        return ttl
+
+    def _get_crumb(self, refresh=False):
+        """Return the CSRF crumb header for the pooled session, fetching it only when needed.
+
+        An empty dict means the controller has CSRF protection disabled.
+        """
+        cls = type(self)
+        with cls._crumb_lock:
+            if cls._crumb is None or refresh:
+                try:
+                    response = self.session.get(self._build_url("crumb_issuer"), auth=self.auth, timeout=self.timeout)
+                    if response.status_code == 404:
+                        cls._crumb = {}
+                    else:
+                        response.raise_for_status()
+                        data = response.json()
+                        cls._crumb = {data["crumbRequestField"]: data["crumb"]}
+                except (requests.exceptions.RequestException, ValueError, KeyError):
+                    return {}  # try the POST without a crumb; it is retried on a 403
+            return cls._crumb
 
     def _post_request(self, url, params={}):
-        """Helper function to perform POST requests with error handling."""
+        """Helper function to perform POST requests with error handling.
+
+        POSTs are not idempotent and are never retried, but they honour the circuit
+        breaker and the latency budget.
+        """
+        note_write()
+        timeout = clamp_timeout(self.timeout)
+        if timeout is None:
+            return {"error": "Latency budget exhausted for this request."}
+        if not self.breaker.allow():
+            return {"error": f"Jenkins is unavailable, retry in {self.breaker.retry_after():.0f}s."}
+
         try:
-            response = requests.post(url, auth=self.auth, params=params)
+            response = self.session.post(url, auth=self.auth, params=params, headers=self._get_crumb(), timeout=timeout)
+            if response.status_code == 403 and "crumb" in response.text.lower():
+                # Crumb expired (e.g. controller restart): refresh once and retry
+                response = self.session.post(url, auth=self.auth, params=params, headers=self._get_crumb(refresh=True), timeout=timeout)
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
             response.raise_for_status()
-            return {"message": "Request successful"}
+            return {"message": "Request successful", "location": response.headers.get("Location")}
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            self.breaker.record_failure()
+            return {"error": str(e)}
+        except requests.exceptions.HTTPError as e:
+            return {"error": str(e)}  # outcome already recorded from the status code
         except requests.exceptions.RequestException as e:
+            self.breaker.record_failure()
             return {"error": str(e)}
 
     def get_all_jobs(self, user):
         """List all jobs available for the user."""
-        url = f"{self.base_url}{self.endpoints['jobs_endpoint']}"
-        data = self._get_request(url)
+        data = self._get_cached("jobs_endpoint")
 
         if "error" in data:
             return data
 
-        jobs = [job["name"] for job in data.get("jobs", [])]
+        # Filter jobs based on user role; the view is reused until the job list is refetched
+        jobs = self.policy.view(user["role"], data, lambda: [job["name"] for job in data.get("jobs", [])])
+
+        return {"jobs": jobs}
+
+    def get_all_jobs_recursive(self, user, max_depth=None, timeout=None):
+        """List every job path inside folders and multibranch projects, crawled concurrently.
+
+        Returns {"jobs": [...], "complete": bool, "errors": {...}}; complete is False
+        when the depth limit or timeout cut the crawl short.
+        """
+        crawler = JobCrawler(
+            self,
+            max_workers=int(os.getenv("JENKINS_CRAWL_WORKERS", "8")),
+            max_depth=max_depth if max_depth is not None else int(os.getenv("JENKINS_CRAWL_DEPTH", "5")),
+            timeout=timeout if timeout is not None else float(os.getenv("JENKINS_CRAWL_TIMEOUT", "60")),
+        )
+        result = crawler.crawl()
 
         # Filter jobs based on user role
-        if user["role"] != "admin":
-            jobs = [job for job in jobs if not job.lower().startswith("admin")]
+        result["jobs"] = self.policy.filter(user["role"], result["jobs"])
 
-        return {"jobs": jobs}
+        return result
+
+    def refresh_job_index(self, force=False):
+        """Sync the shared job index with a recursive crawl once it is older than its TTL.
+
+        The first fill runs in the caller; later refreshes run on a background thread
+        while lookups keep using the current index. The crawl never holds the lock,
+        and only one runs at a time. The index is diffed in place, so only added or
+        removed jobs are re-indexed, and a partial crawl only adds jobs.
+        """
+        cls = type(self)
+        with cls._job_index_lock:
+            refreshed = cls._job_index_refreshed
+            if cls._job_index_refreshing:
+                return
+            if not force and refreshed is not None and time.monotonic() - refreshed < self.job_index_ttl:
+                return
+            cls._job_index_refreshing = True
+
+        if len(self.job_index):
+            threading.Thread(target=self._crawl_job_index, name="jenkins-job-index", daemon=True).start()
+        else:
+            self._crawl_job_index()
+
+    def _crawl_job_index(self):
+        cls = type(self)
+        try:
+            result = self.get_all_jobs_recursive({"role": "admin"})
+            if result["jobs"]:
+                self.job_index.update(result["jobs"], complete=result["complete"])
+            if result["complete"]:
+                with cls._job_index_lock:
+                    cls._job_index_refreshed = time.monotonic()
+        finally:
+            with cls._job_index_lock:
+                cls._job_index_refreshing = False
+
+    def resolve_job_name(self, job_name, user=None, fuzzy=True, strict=False):
+        """Resolve a possibly misspelled job name locally.
+
+        Returns {"job": name} or {"error": ..., "suggestions": [...]}. Names are passed
+        through unchanged when the index could not be populated, unless `strict` is set
+        (e.g. for the intent router, which then leaves the query to the agent).
+        """
+        self.refresh_job_index()
+        if not len(self.job_index):
+            if strict:
+                return {"error": "The job index is not available.", "suggestions": []}
+            return {"job": job_name.strip()}
+
+        # Filter jobs based on user role
+        allowed = self.policy.matcher(user["role"] if user else DEFAULT_ROLE)
+        return self.job_index.resolve(job_name, allowed=allowed, fuzzy=fuzzy)
+
+    def get_jobs_page(self, user, cursor=0, page_size=10):
+        """Fetch one page of job names using a server-side `jobs[name]{start,end}` range.
+
+        `cursor` is an offset into Jenkins' unfiltered job list; pass the returned
+        `next_cursor` back to get the following page (None when there are no more jobs).
+        """
+        # The page depends on the caller's cursor, so answers built on it are not cached
+        note_session()
+        jobs = []
+        position = cursor
+        while True:
+            # Ask for one extra job so we know whether another page exists
+            tree = f"jobs[name]{{{position},{position + page_size + 1}}}"
+            data = self._get_cached("jobs_endpoint", tree=tree)
+
+            if "error" in data:
+                return data
+
+            batch = [job["name"] for job in data.get("jobs", [])]
+            allowed = self.policy.matcher(user["role"])
+            for offset, job in enumerate(batch):
+                # Filter jobs based on user role
+                if not allowed(job):
+                    continue
+                if len(jobs) == page_size:
+                    return {"jobs": jobs, "next_cursor": position + offset}
+                jobs.append(job)
+
+            position += len(batch)
+            if len(batch) < page_size + 1:
+                return {"jobs": jobs, "next_cursor": None}
 
     def trigger_job(self, user, job_name, params={}):
-        """Trigger a Jenkins job."""
-        if user["role"] != "admin" and job_name.lower().startswith("admin"):
+        """Trigger a Jenkins job (uses buildWithParameters when params are given)."""
+        if not self.policy.allows(user["role"], job_name):
             return {"error": "Access denied"}
 
-        url = f"{self.base_url}{self.endpoints['build_endpoint'].format(job_name=job_name)}"
-        return self._post_request(url, params)
+        endpoint = "build_with_parameters_endpoint" if params else "build_endpoint"
+        url = self._build_url(endpoint, job_name=job_name)
+        result = self._post_request(url, params)
+
+        if "error" not in result:
+            # A new build makes every cached response for this job stale
+            self.cache.invalidate(tag=job_name)
+
+            # Follow the queue item to its build in the background
+            queue_id = parse_queue_id(result.pop("location", None))
+            if queue_id is not None:
+                result["queue_id"] = queue_id
+                self.tracker.track(queue_id, job_name)
+        return result
+
+    def trigger_jobs(self, user, job_names, params=None, matrix=None):
+        """Trigger many jobs, optionally once per parameter-matrix combination.
+
+        Calls are rate limited (JENKINS_TRIGGER_RATE per second) and capped at
+        JENKINS_TRIGGER_CONCURRENCY in flight. Returns {"results": [...]} with one
+        outcome per trigger.
+        """
+        bulk = BulkTrigger(
+            self,
+            rate=float(os.getenv("JENKINS_TRIGGER_RATE", "5")),
+            max_workers=int(os.getenv("JENKINS_TRIGGER_CONCURRENCY", "4")),
+        )
+        return {"results": bulk.run(user, job_names, params, matrix)}
+
+    def get_triggered_build_status(self, job_name):
+        """State of the most recent build triggered for a job from this process."""
+        note_read(job_name)
+        handle = self.tracker.latest(job_name)
+        if handle is None:
+            return {"error": f"No build of '{job_name}' has been triggered in this session."}
+        return handle.to_dict()
+
+    def start_notification_receiver(self, host=None, port=None):
+        """Start the shared notification receiver (JENKINS_NOTIFY_HOST/PORT) if it is not running.
+
+        While it runs the build tracker only polls as a fallback for lost events.
+        Binding anywhere but loopback requires JENKINS_NOTIFY_TOKEN (ValueError otherwise).
+        """
+        cls = type(self)
+        tracker = self.tracker
+        with cls._session_lock:
+            if cls._receiver is None:
+                cls._receiver = NotificationReceiver(
+                    self,
+                    host=host or os.getenv("JENKINS_NOTIFY_HOST", "127.0.0.1"),
+                    port=int(port if port is not None else os.getenv("JENKINS_NOTIFY_PORT", "8787")),
+                    token=os.getenv("JENKINS_NOTIFY_TOKEN"),
+                ).start()
+                tracker.push_enabled = True
+            return cls._receiver
+
+    def stop_notification_receiver(self):
+        """Stop the shared notification receiver and return the tracker to normal polling."""
+        cls = type(self)
+        with cls._session_lock:
+            if cls._receiver is not None:
+                cls._receiver.stop()
+                cls._receiver = None
+                if cls._tracker is not None:
+                    cls._tracker.push_enabled = False
+
+    def apply_build_event(self, job_name, build):
+        """Fold a pushed build update into the cache, the history store and the tracker.
+
+        `build` carries number, result, url, building and optionally queueId, timestamp
+        and duration. Afterwards last/specific build questions for it need no request.
+        """
+        last_key = self._cache_key("last_build_summary", job_name=job_name)
+        last = self.cache.get(last_key)
+
+        # Health, history pages and the snapshot all changed; drop them first
+        self.cache.invalidate(tag=job_name)
+        self.cache.invalidate(key=self._cache_key("status_snapshot"))
+
+        # Before caching: a tracked build finishing invalidates the job's entries again
+        if build.get("queueId") is not None:
+            self.tracker.notify(job_name, build)
+
+        summary = {field: build.get(field) for field in ("number", "result", "url", "building", "timestamp", "duration")}
+        ttl = self._ttl_for("pushed", summary)
+        specific_key = self._cache_key("specific_build_summary", job_name=job_name, build_number=str(build["number"]))
+        self.cache.set(specific_key, summary, ttl, tag=job_name)
+        # Events can arrive out of order; never replace a newer last build with an older one
+        if last is None or (last.get("number") or 0) <= build["number"]:
+            self.cache.set(last_key, summary, ttl, tag=job_name)
+        else:
+            self.cache.set(last_key, last, self._ttl_for("pushed", last), tag=job_name)
+
+        # Stored without a sync point: builds missed before this event are still synced later
+        self.store.upsert(job_name, [summary])
 
     def get_last_build_summary(self, job_name):
         """Retrieve last build summary."""
-        url = f"{self.base_url}{self.endpoints['last_build_summary'].format(job_name=job_name)}"
-        return self._get_request(url)
+        return self._get_cached("last_build_summary", job_name=job_name)
 
     def get_specific_build_summary(self, job_name, build_number):
-        """Retrieve a specific build summary."""
-        url = f"{self.base_url}{self.endpoints['specific_build_summary'].format(job_name=job_name, build_number=build_number)}"
-        return self._get_request(url)
+        """Retrieve a specific build summary, from the local store when the build is finished."""
+        if str(build_number).isdigit():
+            note_read(job_name)
+            build = self.store.get(job_name, build_number)
+            if build is not None and not build["building"]:
+                return build
+
+        data = self._get_cached("specific_build_summary", job_name=job_name, build_number=str(build_number))
+        if "error" not in data and not data.get("building"):
+            self.store.upsert(job_name, [data])
+        return data
 
     def get_job_health(self, job_name):
         """Get job health information."""
-        url = f"{self.base_url}{self.endpoints['job_health'].format(job_name=job_name)}"
-        return self._get_request(url)
+        return self._get_cached("job_health", job_name=job_name)
+
+    def sync_build_history(self, job_name, limit=None):
+        """Pull builds newer than the store's sync point for a job, newest first in pages.
+
+        Paging stops at the first build at or below the sync point, so a job with a long
+        history costs one small request once it is in sync. The first sync of a job goes
+        back at most `limit` builds (JENKINS_HISTORY_LIMIT, which also caps `limit`) and
+        fetches them in a single projected request.
+        """
+        limit = min(limit or self.history_limit, self.history_limit)
+        since = self.store.sync_point(job_name)
+        fields = self.endpoints["projections"]["build_history"]
+        page_size = self.history_page_size if since else limit
+        fetched, start, error = [], 0, None
+
+        while start < limit:
+            end = min(start + page_size, limit)
+            data = self._get_cached("build_history", job_name=job_name, tree=f"{fields}{{{start},{end}}}")
+            if "error" in data:
+                error = data["error"]
+                break
+            builds = data.get("allBuilds", [])
+            new = [build for build in builds if build["number"] > since]
+            fetched.extend(new)
+            if len(new) < len(builds) or len(builds) < end - start:
+                break
+            start = end
+
+        if error:
+            # Older pages are missing, so the watermark stays put and the next sync retries them
+            self.store.upsert(job_name, fetched)
+            return {"error": error, "synced": len(fetched)}
+
+        # Everything up to the oldest build still running (or the newest build) is now final
+        running = [build["number"] for build in fetched if build.get("building")]
+        newest = max((build["number"] for build in fetched), default=since)
+        self.store.upsert(job_name, fetched, sync_point=min(running) - 1 if running else newest)
+        return {"synced": len(fetched)}
+
+    def get_build_history(self, job_name, limit=100, result=None, since=None):
+        """The job's most recent builds (newest first), served from the synced local store.
+
+        `result` filters on e.g. "FAILURE", `since` on start time (epoch ms). When Jenkins
+        cannot be reached, whatever is already stored is returned with "stale": True.
+        """
+        # The store keeps the full synced depth; `limit` only bounds what is returned
+        sync = self.sync_build_history(job_name)
+        builds = self.store.history(job_name, limit, result=result, since=since)
+        if "error" in sync:
+            if not builds:
+                return {"error": sync["error"]}
+            return {"builds": builds, "stale": True}
+        return {"builds": builds}
+
+    def get_job_analytics(self, job_name, limit=100):
+        """Success rate, flakiness, p50/p95 duration and trends over the job's build history."""
+        history = self.get_build_history(job_name, limit)
+        if "error" in history:
+            return history
+        return compute_health(history["builds"])
+
+    def get_status_snapshot(self, user):
+        """Name, color, last build and health score of every job in a single request."""
+        data = self._get_cached("status_snapshot")
+
+        if "error" in data:
+            return data
+
+        snapshot = []
+        allowed = self.policy.matcher(user["role"])
+        for job in data.get("jobs", []):
+            # Filter jobs based on user role
+            if not allowed(job["name"]):
+                continue
+            health = job.get("healthReport") or [{}]
+            snapshot.append({
+                "name": job["name"],
+                "color": job.get("color"),
+                "last_build": job.get("lastBuild"),
+                "health": health[0].get("score"),
+            })
+
+        return {"jobs": snapshot}
+
+    def get_console_log(self, job_name, build_number="lastBuild", start=0, tail_bytes=None,
+                        follow=False, poll_interval=2, chunk_size=64 * 1024):
+        """Stream a build's console output via logText/progressiveText.
+
+        Yields {"text": str, "offset": int, "more": bool} chunks so memory stays
+        bounded by chunk_size. `offset` is where to resume after a reconnect (pass it
+        back as `start`); it is exact at the end of each fetch. `tail_bytes` starts
+        that many bytes from the end instead of at `start`, and `follow` keeps polling
+        until Jenkins reports the build finished. On failure an {"error": ...} chunk is
+        yielded and the generator stops.
+        """
+        url = self._build_url("console_log", job_name=job_name, build_number=build_number)
+        note_read(job_name)
+
+        try:
+            if tail_bytes is not None:
+                # Jenkins sends X-Text-Size before the body, so read the headers and hang up
+                response = self._guarded_get(url, params={"start": 0}, stream=True)
+                if isinstance(response, dict):
+                    yield {**response, "offset": start}
+                    return
+                with response:
+                    response.raise_for_status()
+                    start = max(int(response.headers.get("X-Text-Size", 0)) - tail_bytes, 0)
+
+            # One decoder for the whole stream: a fetch may end in the middle of a UTF-8 character
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            while True:
+                response = self._guarded_get(url, params={"start": start}, stream=True)
+                if isinstance(response, dict):
+                    yield {**response, "offset": start}
+                    return
+                with response:
+                    response.raise_for_status()
+                    more = response.headers.get("X-More-Data") == "true"
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        text = decoder.decode(chunk)
+                        if text:
+                            yield {"text": text, "offset": start, "more": True}
+                    start = int(response.headers.get("X-Text-Size", start))
+
+                if not (follow and more):
+                    yield {"text": decoder.decode(b"", final=True), "offset": start, "more": more}
+                    return
+                yield {"text": "", "offset": start, "more": more}
+                time.sleep(poll_interval)
+        except requests.exceptions.RequestException as e:
+            yield {"error": str(e), "offset": start}
+
+    def get_build_failures(self, job_name, build_number="lastBuild"):
+        """Extract failure excerpts (with line numbers) from a build's console output.
+
+        The log is streamed straight into the scanner, so only the excerpts are kept in
+        memory. The result includes a "summary" string ready to hand to the agent.
+        """
+        errors = []
+
+        def chunks():
+            for chunk in self.get_console_log(job_name, build_number):
+                if "error" in chunk:
+                    errors.append(chunk["error"])
+                    return
+                yield chunk["text"]
+
+        result = FailureScanner().scan(chunks())
+        if errors:
+            return {"error": errors[0]}
+
+        result["summary"] = format_excerpts(result)
+        return result
+
+    def get_test_report(self, job_name, build_number="lastBuild"):
+        """Failing tests of a build, grouped by class with counts and top error messages.
+
+        The testReport JSON (tens of MB for integration jobs) is streamed through an
+        incremental parser instead of response.json(), and projected to the fields read.
+        The result includes a "summary" string ready to hand to the agent.
+        """
+        url = self._build_url("test_report", job_name=job_name, build_number=build_number)
+        note_read(job_name)
+        response = self._guarded_get(url, stream=True)
+        if isinstance(response, dict):
+            return response
+        try:
+            with response:
+                if response.status_code == 404:
+                    return {"error": f"Build {build_number} of '{job_name}' has no test report."}
+                response.raise_for_status()
+                response.raw.decode_content = True
+                report = parse_test_report(response.raw)
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+        except ValueError as e:
+            return {"error": f"Invalid test report: {e}"}
+
+        report["summary"] = format_test_report(report)
+        return report
+
+    def list_artifacts(self, job_name, build_number="lastBuild"):
+        """File name, relative path and download URL of every artifact archived by a build."""
+        data = self._get_cached("build_artifacts", job_name=job_name, build_number=str(build_number))
+        if "error" in data:
+            return data
+        base = data.get("url", "")
+        return {
+            "build_number": data.get("number"),
+            "artifacts": [
+                {
+                    "file_name": artifact["fileName"],
+                    "relative_path": artifact["relativePath"],
+                    "url": f"{base}artifact/{quote(artifact['relativePath'])}",
+                }
+                for artifact in data.get("artifacts", [])
+            ],
+        }
+
+    def download_artifact(self, job_name, relative_path, build_number="lastBuild", dest=None,
+                          checksum=None, algorithm="sha256", chunk_size=1024 * 1024):
+        """Stream an artifact to disk in chunks, resuming interrupted downloads with HTTP Range.
+
+        Data goes to `dest` (default: JENKINS_DOWNLOAD_DIR/<job>/<build>/<relative_path>)
+        via a ".part" file; an existing .part is resumed from its size, and dropped
+        connections are resumed up to `retries` times. If `checksum` is given the file
+        is verified with `algorithm` and removed on mismatch. Returns {"path", "size",
+        "checksum"} or {"error": ...}.
+        """
+        # Writes a file, so answers that download are never cached
+        note_read(job_name)
+        note_write()
+
+        # relative_path comes from user/LLM input: it must stay a plain path below the artifacts root
+        segments = relative_path.replace("\\", "/").split("/")
+        if relative_path.startswith(("/", "\\")) or any(segment in ("", ".", "..") for segment in segments):
+            return {"error": f"Invalid artifact path '{relative_path}'."}
+
+        # Pin symbolic builds such as lastBuild so a resume never mixes two builds
+        if not str(build_number).isdigit():
+            data = self._get_request(self._build_url("build_artifacts", job_name=job_name, build_number=build_number))
+            if "error" in data:
+                return data
+            build_number = data["number"]
+
+        if dest is None:
+            dest = os.path.join(self.download_dir, *job_name.split("/"), str(build_number), *segments)
+            root = os.path.realpath(self.download_dir)
+            if os.path.commonpath([root, os.path.realpath(dest)]) != root:
+                return {"error": f"Invalid artifact path '{relative_path}'."}
+        part = dest + ".part"
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        url = self._build_url(
+            "artifact_download", job_name=job_name, build_number=build_number, relative_path=quote(relative_path)
+        )
+
+        digest = hashlib.new(algorithm) if checksum else None
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        if digest and offset:
+            with open(part, "rb") as f:
+                for block in iter(lambda: f.read(chunk_size), b""):
+                    digest.update(block)
+
+        error = None
+        for attempt in range(self.retries + 1):
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            # Connecting is retried (and breaker/budget checked) by _guarded_get; this loop resumes dropped bodies
+            response = self._guarded_get(url, headers=headers, stream=True)
+            if isinstance(response, dict):
+                error = response["error"]
+                break
+            try:
+                with response:
+                    if response.status_code == 416:
+                        # Nothing past offset: the .part file is already complete
+                        error = None
+                        break
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        # Range ignored, the full file is coming again
+                        offset = 0
+                        digest = hashlib.new(algorithm) if checksum else None
+                    with open(part, "ab" if offset else "wb") as f:
+                        for block in response.iter_content(chunk_size=chunk_size):
+                            f.write(block)
+                            offset += len(block)
+                            if digest:
+                                digest.update(block)
+                error = None
+                break
+            except requests.exceptions.HTTPError as e:
+                return {"error": str(e)}
+            except requests.exceptions.RequestException as e:
+                # offset and digest already cover every block written; resume from there
+                self.breaker.record_failure()
+                error = str(e)
+                if attempt < self.retries:
+                    delay = backoff_delay(attempt)
+                    budget = remaining_budget()
+                    if budget is not None and delay >= budget:
+                        break
+                    time.sleep(delay)
+
+        if error:
+            return {"error": f"Download interrupted at {offset} bytes (run again to resume): {error}"}
+
+        if digest and digest.hexdigest().lower() != checksum.lower():
+            os.remove(part)
+            return {"error": f"Checksum mismatch for {relative_path}: expected {checksum}, got {digest.hexdigest()}."}
+
+        os.replace(part, dest)
+        return {"path": dest, "size": os.path.getsize(dest), "checksum": digest.hexdigest() if digest else None}
 
@@ -0,0 +1,78 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Job classes that contain other jobs rather than being buildable themselves
+CONTAINER_CLASSES = (
+    "com.cloudbees.hudson.plugins.folder.Folder",
+    "jenkins.branch.OrganizationFolder",
+    "org.jenkinsci.plugins.workflow.multibranch.WorkflowMultiBranchProject",
+)
+
+class JobCrawler:
+    """Breadth-first crawl of folders and multibranch projects with a bounded worker pool.
+
+    Every folder found is fetched concurrently (one `tree=jobs[name,_class]` request
+    each). Results are full job paths such as "team/service/main", which the
+    JenkinsOperations endpoints accept directly.
+    """
+
+    def __init__(self, jenkins, max_workers=8, max_depth=5, timeout=60):
+        self.jenkins = jenkins
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.timeout = timeout
+
+    def _list_children(self, folder):
+        """Return the (name, _class) children of a folder, or of the root when folder is None."""
+        if folder is None:
+            data = self.jenkins._get_cached("jobs_endpoint", tree="jobs[name,_class]")
+        else:
+            data = self.jenkins._get_cached("folder_jobs", job_name=folder)
+        if "error" in data:
+            raise RuntimeError(data["error"])
+        return [(job["name"], job.get("_class", "")) for job in data.get("jobs", [])]
+
+    def crawl(self):
+        """Walk the job tree and return every buildable job path.
+
+        Returns {"jobs": [...], "complete": bool, "errors": {folder: message}}. When the
+        timeout expires the jobs found so far are returned with complete=False.
+        """
+        deadline = time.monotonic() + self.timeout
+        jobs, errors = [], {}
+        complete = True
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # Workers run in a copy of the caller's context so the latency budget applies to them too
+        pending = {executor.submit(contextvars.copy_context().run, self._list_children, None): (None, 0)}
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                done, _ = wait(pending, timeout=max(remaining, 0), return_when=FIRST_COMPLETED)
+                if not done:
+                    complete = False
+                    break
+
+                for future in done:
+                    folder, depth = pending.pop(future)
+                    try:
+                        children = future.result()
+                    except Exception as e:
+                        errors[folder or "/"] = str(e)
+                        complete = False
+                        continue
+
+                    for name, job_class in children:
+                        path = f"{folder}/{name}" if folder else name
+                        if job_class not in CONTAINER_CLASSES:
+                            jobs.append(path)
+                        elif depth < self.max_depth:
+                            future = executor.submit(contextvars.copy_context().run, self._list_children, path)
+                            pending[future] = (path, depth + 1)
+                        else:
+                            complete = False
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return {"jobs": sorted(jobs), "complete": complete, "errors": errors}
@@ -0,0 +1,128 @@
+import bisect
+import re
+import threading
+from collections import Counter
+
+_SEPARATORS = re.compile(r"[\s_\-.]+")
+
+def normalize(name):
+    """Case- and separator-insensitive form of a job name ("My_Job-1" -> "myjob1")."""
+    return _SEPARATORS.sub("", name.strip().strip("'\"`").lower())
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class JobIndex:
+    """In-memory index of job names for resolving slightly wrong names locally.
+
+    Lookups try, in order: exact name, normalized name (case/separators ignored),
+    normalized prefix (sorted keys + bisect) and finally character-trigram
+    similarity. Both the full path and its last segment are indexed, so "main"
+    finds "team/service/main".
+    """
+
+    def __init__(self, min_score=0.5):
+        self.min_score = min_score
+        self._names = set()
+        self._by_key = {}  # normalized key -> set of job names
+        self._sorted_keys = []
+        self._grams = {}  # trigram -> set of job names
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._names)
+
+    def _keys(self, name):
+        keys = {normalize(name)}
+        if "/" in name:
+            keys.add(normalize(name.rsplit("/", 1)[1]))
+        return keys
+
+    def update(self, names, complete=True):
+        """Make the index match `names`, touching only jobs that were added or removed.
+
+        With complete=False (a crawl cut short) `names` may miss jobs that still
+        exist, so jobs are only added, never removed.
+        """
+        names = set(names)
+        with self._lock:
+            if not complete:
+                names |= self._names
+            added, removed = names - self._names, self._names - names
+            for name in removed:
+                for key in self._keys(name):
+                    self._by_key[key].discard(name)
+                    if not self._by_key[key]:
+                        del self._by_key[key]
+                        self._sorted_keys.pop(bisect.bisect_left(self._sorted_keys, key))
+                    for gram in _trigrams(key):
+                        self._grams[gram].discard(name)
+            for name in added:
+                for key in self._keys(name):
+                    if key not in self._by_key:
+                        self._by_key[key] = set()
+                        bisect.insort(self._sorted_keys, key)
+                    self._by_key[key].add(name)
+                    for gram in _trigrams(key):
+                        self._grams.setdefault(gram, set()).add(name)
+            self._names = names
+        return {"added": len(added), "removed": len(removed)}
+
+    def resolve(self, query, limit=5, allowed=None, fuzzy=True):
+        """Resolve `query` to a single job name or a ranked list of suggestions.
+
+        Returns {"job": name} on a confident match, otherwise
+        {"error": ..., "suggestions": [...]}. `allowed` optionally filters which
+        names may be returned (e.g. role visibility). With fuzzy=False only exact
+        and normalized matches resolve; anything else becomes a suggestion, which
+        is what side-effecting tools such as triggers should use.
+        """
+        allowed = allowed or (lambda name: True)
+        query = query.strip().strip("'\"`")
+        key = normalize(query)
+
+        with self._lock:
+            if query in self._names and allowed(query):
+                return {"job": query}
+
+            exact = sorted(name for name in self._by_key.get(key, ()) if allowed(name))
+            if len(exact) == 1:
+                return {"job": exact[0]}
+            if exact:
+                return {"error": f"'{query}' matches several jobs.", "suggestions": exact[:limit]}
+
+            prefixed = set()
+            start = bisect.bisect_left(self._sorted_keys, key)
+            for candidate in self._sorted_keys[start:]:
+                if not key or not candidate.startswith(key):
+                    break
+                prefixed.update(name for name in self._by_key[candidate] if allowed(name))
+            if fuzzy and len(prefixed) == 1:
+                return {"job": next(iter(prefixed))}
+
+            ranked = self._rank(key, allowed)
+            if fuzzy and not prefixed and ranked and ranked[0][1] >= self.min_score and (
+                len(ranked) == 1 or ranked[0][1] - ranked[1][1] >= 0.15
+            ):
+                return {"job": ranked[0][0]}
+
+            suggestions = sorted(prefixed) + [name for name, _ in ranked if name not in prefixed]
+            message = f"'{query}' matches several jobs." if len(prefixed) > 1 else f"Job '{query}' not found."
+            return {"error": message, "suggestions": suggestions[:limit]}
+
+    def _rank(self, key, allowed):
+        """Rank names by trigram (Dice) similarity with the normalized query."""
+        grams = _trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+
+        scored = []
+        for name, count in shared.items():
+            if not allowed(name):
+                continue
+            best = max(len(_trigrams(k)) for k in self._keys(name))
+            scored.append((name, 2 * count / (len(grams) + best)))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored
@@ -0,0 +1,74 @@
+import fnmatch
+import json
+import re
+import threading
+
+DEFAULT_ROLE = "default"
+
+def _compile(rules):
+    """Compile glob rules ("release/*") and regex rules ("re:^team-(a|b)/") into one regex.
+
+    Matching is case-insensitive; returns None for an empty rule list.
+    """
+    if not rules:
+        return None
+    parts = [rule[3:] if rule.startswith("re:") else fnmatch.translate(rule) for rule in rules]
+    return re.compile("|".join(f"(?:{part})" for part in parts), re.IGNORECASE)
+
+class JobPolicy:
+    """Role-based job visibility compiled once from config/roles.json.
+
+    Each role lists include and exclude rules; a job is visible when it matches an
+    include rule and no exclude rule. Roles missing from the config use "default".
+    Filtered views of a job list are cached per role until the list object changes.
+    """
+
+    def __init__(self, roles):
+        self._matchers = {}
+        for role, rules in roles.items():
+            include = _compile(rules.get("include", ["*"]))
+            exclude = _compile(rules.get("exclude", []))
+            self._matchers[role] = self._matcher(include, exclude)
+        self._matchers.setdefault(DEFAULT_ROLE, lambda job: False)
+        self._views = {}  # role -> (source, visible job names)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def _matcher(include, exclude):
+        if include is None:
+            return lambda job: False
+        if exclude is None:
+            return lambda job: include.match(job) is not None
+        return lambda job: include.match(job) is not None and exclude.match(job) is None
+
+    def matcher(self, role):
+        """Predicate job_name -> bool for a role."""
+        return self._matchers.get(role, self._matchers[DEFAULT_ROLE])
+
+    def allows(self, role, job_name):
+        return self.matcher(role)(job_name)
+
+    def filter(self, role, jobs):
+        """Visible jobs for a role, in one pass over the list."""
+        return list(filter(self.matcher(role), jobs))
+
+    def view(self, role, source, names):
+        """Visible job names for a role, cached until `source` is a different object.
+
+        `source` is the job-list response the names came from (the response cache
+        hands back the same object until it refreshes); `names` is called to list
+        them only when the view has to be rebuilt.
+        """
+        with self._lock:
+            cached = self._views.get(role)
+            if cached is not None and cached[0] is source:
+                return cached[1]
+        visible = self.filter(role, names())
+        with self._lock:
+            self._views[role] = (source, visible)
+        return visible
@@ -0,0 +1,147 @@
+import mmap
+import re
+from collections import Counter, deque
+
+# Common failure signatures; patterns must only use non-capturing groups
+FAILURE_PATTERNS = {
+    "compiler_error": r"\berror(?:\[\w+\])?:|\berror [A-Z]+\d+:|COMPILATION ERROR|cannot find symbol|undefined reference to",
+    "test_failure": r"Tests run: \d+, Failures: [1-9]|\bFAILED\b|AssertionError|There (?:was|were) \d+ failures?",
+    "oom": r"OutOfMemoryError|Out of memory|Cannot allocate memory|Killed process|exit code 137",
+    "timeout": r"Build timed out|TimeoutException|\btimed out\b|deadline exceeded",
+    "exception": r"Traceback \(most recent call last\)|Exception in thread|\bpanic:",
+    "build_failure": r"BUILD FAILURE|ERROR: script returned exit code|FATAL:|Finished: (?:FAILURE|ABORTED)",
+}
+
+# Literals of which every pattern above contains at least one. Substring search runs
+# at memchr speed, so the regex only ever sees lines that contain one of these.
+PREFILTER_KEYWORDS = (
+    "rror", "ERROR", "cannot find symbol", "undefined reference", "Failures: ", "FAILED",
+    "failure", "memory", "Killed process", "exit code 137", "timed out", "Exception",
+    "deadline exceeded", "Traceback", "panic:", "FAILURE", "FATAL:", "ABORTED",
+)
+
+MAX_LINE_LENGTH = 500
+MMAP_WINDOW = 4 * 1024 * 1024
+
+class FailureScanner:
+    """Single-pass failure extraction over console output.
+
+    Input is consumed as chunks (str, or bytes for on-disk logs), so memory is
+    bounded by the chunk size plus the excerpts kept. Each line-aligned block is
+    searched for the prefilter keywords; only lines containing one are run
+    through the combined signature regex.
+    """
+
+    def __init__(self, patterns=FAILURE_PATTERNS, keywords=PREFILTER_KEYWORDS, context=2, max_excerpts=50):
+        alternation = "|".join(f"(?P<{name}>{pattern})" for name, pattern in patterns.items())
+        self.patterns = {str: re.compile(alternation), bytes: re.compile(alternation.encode())}
+        self.keywords = {str: tuple(keywords), bytes: tuple(k.encode() for k in keywords)}
+        self.context = context
+        self.max_excerpts = max_excerpts
+
+    def _matching_lines(self, block):
+        """Yield (start, end, category) for each matching line of a line-aligned block, in order."""
+        kind = type(block)
+        newline = "\n" if kind is str else b"\n"
+        spans = set()
+        for keyword in self.keywords[kind]:
+            pos = block.find(keyword)
+            while pos >= 0:
+                start = block.rfind(newline, 0, pos) + 1
+                end = block.find(newline, pos)
+                end = len(block) if end < 0 else end
+                spans.add((start, end))
+                pos = block.find(keyword, end)
+
+        pattern = self.patterns[kind]
+        for start, end in sorted(spans):
+            match = pattern.search(block, start, end)
+            if match:
+                yield start, end, match.lastgroup
+
+    def scan(self, chunks):
+        """Scan an iterable of text (or bytes) chunks that need not be line aligned.
+
+        Returns {"excerpts": [...], "counts": {category: n}, "lines": total_lines}, where
+        each excerpt carries its 1-based line number and surrounding context lines.
+        """
+        excerpts, counts = [], Counter()
+        tail = deque(maxlen=self.context)  # last lines of the previous blocks
+        waiting = []  # excerpts still collecting trailing context
+        lines = 0
+        carry = None
+
+        def scan_block(block):
+            nonlocal lines, waiting
+            newline = "\n" if isinstance(block, str) else b"\n"
+            block_lines = block.split(newline) if (waiting or self.context) else None
+
+            if waiting:
+                for excerpt in waiting:
+                    needed = self.context - len(excerpt["after"])
+                    excerpt["after"].extend(_decode(line) for line in block_lines[:needed])
+                waiting = [excerpt for excerpt in waiting if len(excerpt["after"]) < self.context]
+
+            index, counted = 0, 0  # 0-based line index within the block
+            for start, end, category in self._matching_lines(block):
+                index += block.count(newline, counted, start)
+                counted = start
+                counts[category] += 1
+                if len(excerpts) >= self.max_excerpts:
+                    continue
+
+                excerpt = {"line": lines + index + 1, "category": category, "text": _decode(block[start:end]),
+                           "before": [], "after": []}
+                if self.context:
+                    before = (list(tail) + block_lines[max(index - self.context, 0):index])[-self.context:]
+                    excerpt["before"] = [_decode(line) for line in before]
+                    excerpt["after"] = [_decode(line) for line in block_lines[index + 1:index + 1 + self.context]]
+                    if len(excerpt["after"]) < self.context:
+                        waiting.append(excerpt)
+                excerpts.append(excerpt)
+
+            lines += block.count(newline) + 1
+            if self.context:
+                tail.extend(block_lines[-self.context:])
+
+        for chunk in chunks:
+            block = chunk if carry is None else carry + chunk
+            cut = block.rfind("\n" if isinstance(block, str) else b"\n")
+            if cut < 0:
+                carry = block
+                continue
+            scan_block(block[:cut])
+            carry = block[cut + 1:]
+        if carry:
+            scan_block(carry)
+
+        return {"excerpts": excerpts, "counts": dict(counts), "lines": lines}
+
+    def scan_file(self, path):
+        """Scan a log file on disk through a memory map, one window at a time."""
+        with open(path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return {"excerpts": [], "counts": {}, "lines": 0}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                windows = (mm[pos:pos + MMAP_WINDOW] for pos in range(0, len(mm), MMAP_WINDOW))
+                return self.scan(windows)
+
+
+def _decode(line):
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="replace")
+    return line.rstrip("\r")[:MAX_LINE_LENGTH]
+
+
+def format_excerpts(result, limit=10):
+    """Render scan results as a compact text block suitable for an LLM prompt."""
+    if not result["excerpts"]:
+        return "No known failure signatures found."
+    counts = ", ".join(f"{category}: {count}" for category, count in sorted(result["counts"].items()))
+    blocks = [f"Failure signatures ({counts}) in {result['lines']} lines:"]
+    for excerpt in result["excerpts"][:limit]:
+        blocks.append(f"[{excerpt['category']}] line {excerpt['line']}:")
+        blocks.extend(f"    {line}" for line in excerpt["before"])
+        blocks.append(f"  > {excerpt['text']}")
+        blocks.extend(f"    {line}" for line in excerpt["after"])
+    return "\n".join(blocks)
@@ -0,0 +1,175 @@
+import argparse
+import hmac
+import ipaddress
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import requests
+
+# Phases sent by the Jenkins Notification plugin; QUEUED events carry no build number
+RUNNING_PHASES = ("STARTED",)
+FINISHED_PHASES = ("COMPLETED", "FINALIZED")
+
+def job_path(url, fallback=None):
+    """Turn a notification job url such as "job/team/job/service/" into "team/service"."""
+    parts = [part for part in (url or "").strip("/").split("/") if part]
+    if len(parts) < 2 or parts[0] != "job":
+        return fallback
+    return "/".join(unquote(name) for marker, name in zip(parts[::2], parts[1::2]) if marker == "job")
+
+def parse_event(payload):
+    """Extract (job_name, build) from a notification-plugin payload, or None to ignore it.
+
+    `build` uses the field names of the Jenkins JSON API (number, result, url,
+    building, queueId, timestamp, duration) so it can be applied like a fetched build.
+    Raises ValueError when the payload does not have the plugin's shape.
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("build") or {}, dict):
+        raise ValueError("Expected a notification object with a \"build\" object")
+    if not all(isinstance(payload.get(field) or "", str) for field in ("name", "url")):
+        raise ValueError("Job name and url must be strings")
+    event = payload.get("build") or {}
+    phase = event.get("phase")
+    if event.get("number") is None or phase not in RUNNING_PHASES + FINISHED_PHASES:
+        return None
+    try:
+        number = int(event["number"])
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid build number {event['number']!r}") from None
+    job_name = job_path(payload.get("url"), payload.get("name"))
+    if not job_name:
+        return None
+    return job_name, {
+        "number": number,
+        "result": event.get("status") if phase in FINISHED_PHASES else None,
+        "url": event.get("full_url") or event.get("url"),
+        "building": phase in RUNNING_PHASES,
+        "queueId": event.get("queue_id"),
+        "timestamp": event.get("timestamp"),
+        "duration": event.get("duration"),
+    }
+
+class NotificationReceiver:
+    """Small HTTP endpoint for Jenkins Notification plugin (JSON over HTTP) build events.
+
+    Every POST is applied with JenkinsOperations.apply_build_event, so the cache,
+    history store and build tracker stay current without polling the controller.
+    When a token is configured, requests must send it as ?token=... or X-Jenkins-Token.
+    A token is required unless the receiver only listens on a loopback address, since
+    accepted events are written to the history store.
+    """
+
+    def __init__(self, jenkins, host="127.0.0.1", port=8787, token=None):
+        self.jenkins = jenkins
+        self.host = host
+        self.port = port
+        self.token = token
+        self.events = 0
+        self._server = None
+        self._thread = None
+
+    def handle_event(self, payload):
+        """Apply one event; returns True if it updated anything."""
+        parsed = parse_event(payload)
+        if parsed is None:
+            return False
+        self.jenkins.apply_build_event(*parsed)
+        self.events += 1
+        return True
+
+    def is_loopback(self):
+        if self.host == "localhost":
+            return True
+        try:
+            return ipaddress.ip_address(self.host).is_loopback
+        except ValueError:
+            return False
+
+    def authorized(self, supplied):
+        """True if one of the supplied tokens matches (or no token is configured)."""
+        if not self.token:
+            return True
+        return any(value and hmac.compare_digest(value.encode(), self.token.encode()) for value in supplied)
+
+    def start(self):
+        """Serve on a background thread."""
+        if not self.token and not self.is_loopback():
+            raise ValueError(f"\u274c JENKINS_NOTIFY_TOKEN is required to receive notifications on {self.host}.")
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                query_token = parse_qs(urlparse(self.path).query).get("token", [None])[0]
+                if not receiver.authorized((self.headers.get("X-Jenkins-Token"), query_token)):
+                    return self._reply(403, {"error": "Invalid token"})
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return self._reply(400, {"error": "Invalid JSON"})
+                try:
+                    applied = receiver.handle_event(payload)
+                except ValueError as e:
+                    return self._reply(400, {"error": str(e)})
+                self._reply(200, {"applied": applied})
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="jenkins-notifications", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+def send_fake_event(url, job_name, number, phase="COMPLETED", status="SUCCESS", queue_id=None,
+                    timestamp=None, duration=None, token=None):
+    """POST a notification-plugin style event to a receiver, as Jenkins would."""
+    job_url = "".join(f"job/{part}/" for part in job_name.split("/"))
+    payload = {
+        "name": job_name.split("/")[-1],
+        "url": job_url,
+        "build": {
+            "full_url": f"http://jenkins.local/{job_url}{number}/",
+            "number": number,
+            "queue_id": queue_id,
+            "phase": phase,
+            "status": status if phase in FINISHED_PHASES else None,
+            "url": f"{job_url}{number}/",
+            "timestamp": timestamp,
+            "duration": duration,
+        },
+    }
+    headers = {"X-Jenkins-Token": token} if token else {}
+    response = requests.post(url, json=payload, headers=headers, timeout=5)
+    response.raise_for_status()
+    return response.json()
+
+if __name__ == "__main__":
+    # Fake event sender for exercising a running receiver without Jenkins
+    parser = argparse.ArgumentParser(description="Send a fake Jenkins notification event.")
+    parser.add_argument("job_name")
+    parser.add_argument("number", type=int)
+    parser.add_argument("--url", default="http://127.0.0.1:8787/")
+    parser.add_argument("--phase", default="COMPLETED", choices=RUNNING_PHASES + FINISHED_PHASES)
+    parser.add_argument("--status", default="SUCCESS")
+    parser.add_argument("--queue-id", type=int)
+    parser.add_argument("--token")
+    args = parser.parse_args()
+    print(send_fake_event(args.url, args.job_name, args.number, args.phase, args.status, args.queue_id, token=args.token))
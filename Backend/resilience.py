@@ -0,0 +1,89 @@
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+class CircuitBreaker:
+    """Fails fast after repeated failures, then lets a single probe through after reset_timeout.
+
+    States: "closed" (normal), "open" (reject everything), "half-open" (one trial call).
+    A probe that never reports back does not wedge the breaker: after another
+    reset_timeout in half-open the next call is let through as a fresh probe.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a call may go out now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                # open -> half-open, or a half-open probe that was never recorded has expired
+                self.state = "half-open"
+                self._opened_at = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half-open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def retry_after(self):
+        """Seconds until the breaker lets a probe through (0 when closed)."""
+        with self._lock:
+            if self.state == "closed":
+                return 0
+            return max(self.reset_timeout - (time.monotonic() - self._opened_at), 0)
+
+
+# Deadline (time.monotonic) for all Jenkins calls made while handling one user turn
+_deadline = contextvars.ContextVar("jenkins_deadline", default=None)
+
+@contextmanager
+def latency_budget(seconds):
+    """Bound the total time Jenkins calls may take inside the block (e.g. one user turn)."""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining_budget():
+    """Seconds left in the current latency budget, or None when no budget is active."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0)
+
+def clamp_timeout(timeout):
+    """Shrink a (connect, read) timeout so it never outlives the current budget.
+
+    Returns None when the budget is already spent.
+    """
+    remaining = remaining_budget()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        return None
+    return tuple(min(part, remaining) for part in timeout)
+
+def backoff_delay(attempt, base=0.5, cap=8):
+    """Full-jitter exponential backoff delay for the given (0-based) retry attempt."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
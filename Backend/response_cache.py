@@ -0,0 +1,124 @@
+import contextvars
+import re
+import threading
+from contextlib import contextmanager
+import sys
+sys.path.append("..")
+
+from backend.ttl_cache import TTLCache
+
+class Dependencies:
+    """Jenkins state read (and whether anything was written) while answering one query."""
+
+    def __init__(self):
+        self.jobs = set()
+        self.global_state = False  # read job lists or snapshots that span every job
+        self.writes = False
+        self.session = False  # read or moved per-conversation state such as the job-page cursor
+
+# Dependencies of the query currently being answered, if any
+_current = contextvars.ContextVar("response_dependencies", default=None)
+
+@contextmanager
+def record_dependencies():
+    """Collect every Jenkins read/write made inside the block (threads started with a copied context included)."""
+    dependencies = Dependencies()
+    token = _current.set(dependencies)
+    try:
+        yield dependencies
+    finally:
+        _current.reset(token)
+
+def note_read(job_name=None):
+    """Record that the current answer read a job's state (or global state when job_name is None)."""
+    dependencies = _current.get()
+    if dependencies is None:
+        return
+    if job_name is None:
+        dependencies.global_state = True
+    else:
+        dependencies.jobs.add(job_name)
+
+def note_write():
+    """Record that the current answer changed Jenkins (such answers are never cached)."""
+    dependencies = _current.get()
+    if dependencies is not None:
+        dependencies.writes = True
+
+def note_session():
+    """Record that the current answer depends on per-conversation state (never cached)."""
+    dependencies = _current.get()
+    if dependencies is not None:
+        dependencies.session = True
+
+# Follow-ups that lean on earlier turns ("and its last build?", "show me more")
+_CONTEXT_WORDS = re.compile(
+    r"\b(?:it|its|this|that|these|those|they|them|their|same|again|more|next|previous|other|one|above)\b"
+)
+
+def depends_on_context(query):
+    """True if a query refers back to the conversation, so its answer depends on chat history."""
+    return _CONTEXT_WORDS.search(query.lower()) is not None
+
+def normalize_query(query):
+    """Lowercase, drop punctuation and collapse whitespace so trivial rephrasings share an entry."""
+    return " ".join(re.sub(r"[^\w\s/.-]", " ", query.lower()).split()).strip(".")
+
+def _unchanged(before, after):
+    """True if every job in `after` that `before` also covers has the same state in both."""
+    previous = dict(before)
+    return all(previous.get(job_name, state) == state for job_name, state in after)
+
+class ResponseCache:
+    """Agent answers keyed on (scope, normalized query), valid while the Jenkins state they read is unchanged.
+
+    `scope` should identify one conversation (e.g. the login session): answers may
+    depend on its memory, so they are never shared across conversations.
+    `fingerprint(dependencies)` summarizes the current state of the jobs an answer
+    read (e.g. last build numbers) as (job, state) pairs; `fingerprint(None)` covers
+    every job. One is taken before the answer and one after: if a job the answer read
+    changed in between, the answer is not stored. The stored fingerprint is compared
+    again on lookup, so an entry dies as soon as one of its jobs builds. Answers that read
+    nothing from Jenkins, triggered anything, used session state, refer back to
+    earlier turns, or whose state could not be fingerprinted are not cached.
+    """
+
+    def __init__(self, fingerprint, max_size=256, ttl=3600):
+        self.fingerprint = fingerprint
+        self.ttl = ttl
+        self._entries = TTLCache(max_size=max_size)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, query, scope=None):
+        """The cached answer if its Jenkins state is unchanged, else None."""
+        key = (scope, normalize_query(query))
+        entry = None if depends_on_context(query) else self._entries.get(key)
+        if entry is not None:
+            dependencies, fingerprint, response = entry
+            if self.fingerprint(dependencies) == fingerprint:
+                with self._lock:
+                    self.hits += 1
+                return response
+            self._entries.invalidate(key=key)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def compute(self, query, scope, answer):
+        """Call answer() while recording its dependencies, and cache the result when allowed."""
+        before = self.fingerprint(None)
+        with record_dependencies() as dependencies:
+            response = answer()
+        if dependencies.writes or dependencies.session or depends_on_context(query):
+            return response
+        if not (dependencies.jobs or dependencies.global_state):
+            return response
+        fingerprint = self.fingerprint(dependencies)
+        if fingerprint is not None and before is not None and _unchanged(before, fingerprint):
+            self._entries.set((scope, normalize_query(query)), (dependencies, fingerprint, response), self.ttl)
+        return response
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,73 @@
+import re
+import time
+from typing import Any, Iterator, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
+
+class ChatStreamHandler(BaseCallbackHandler):
+    """Streams an agent's final answer token by token, plus tool progress events.
+
+    A CONVERSATIONAL_REACT agent runs several generations per turn; only text after
+    the final-answer prefix ("AI:") is user-facing, so tool-selection steps are
+    reported through `on_status` instead. `on_text` receives the answer so far.
+    """
+
+    def __init__(self, on_text, on_status=None, answer_prefix="AI:"):
+        self.on_text = on_text
+        self.on_status = on_status or (lambda message: None)
+        self.answer_prefix = answer_prefix
+        self.answer = ""
+        self._generation = ""
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self._generation = ""
+
+    def on_llm_new_token(self, token, **kwargs):
+        self._generation += token
+        _, found, answer = self._generation.partition(self.answer_prefix)
+        if found and answer.strip():
+            self.answer = answer.strip()
+            self.on_text(self.answer)
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        self.on_status(f"🔧 {(serialized or {}).get('name', 'Tool')}: {input_str}")
+
+    def on_tool_end(self, output, **kwargs):
+        self.on_status("✅ Tool finished, writing the answer...")
+
+    def on_tool_error(self, error, **kwargs):
+        self.on_status(f"❌ Tool failed: {error}")
+
+class FakeStreamingLLM(LLM):
+    """Offline LLM that replays canned responses word by word through the callbacks.
+
+    Responses cycle in order; `delay` seconds pass between tokens. Useful for
+    exercising the streaming UI without Ollama or watsonx.
+    """
+
+    responses: List[str] = ["Thought: Do I need to use a tool? No\nAI: This is a streamed test answer."]
+    delay: float = 0.05
+    index: int = 0
+
+    @property
+    def _llm_type(self):
+        return "fake-streaming"
+
+    def _next_response(self):
+        response = self.responses[self.index % len(self.responses)]
+        self.index += 1
+        return response
+
+    def _stream(self, prompt, stop=None, run_manager=None, **kwargs: Any) -> Iterator[GenerationChunk]:
+        # Words with their surrounding whitespace, so the joined tokens equal the response
+        for token in re.findall(r"\s*\S+\s*", self._next_response()):
+            chunk = GenerationChunk(text=token)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+            time.sleep(self.delay)
+
+    def _call(self, prompt, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        return "".join(chunk.text for chunk in self._stream(prompt, stop, run_manager, **kwargs))
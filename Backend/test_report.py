@@ -0,0 +1,68 @@
+from collections import Counter
+
+import ijson
+
+FAILED_STATUSES = ("FAILED", "REGRESSION")
+CASE_PREFIX = "suites.item.cases.item"
+
+def _error_message(case):
+    """First line of a failure's error details, trimmed, for grouping similar failures."""
+    details = (case.get("errorDetails") or "").strip()
+    return details.splitlines()[0][:200] if details else "(no error message)"
+
+def parse_test_report(stream, top=3):
+    """Aggregate a testReport JSON document read incrementally from a binary stream.
+
+    Only one test case is materialized at a time, so memory stays flat however large
+    the report is. Failures are grouped by class (suite) with a count, the failing
+    test names and the most common error messages. Raises ValueError on malformed JSON.
+    """
+    totals = {"failCount": 0, "passCount": 0, "skipCount": 0}
+    failures = {}  # className -> {"count", "tests", "messages"}
+    builder = None
+
+    try:
+        for prefix, event, value in ijson.parse(stream):
+            if prefix in totals:
+                totals[prefix] = value
+                continue
+            if prefix == CASE_PREFIX and event == "start_map":
+                builder = ijson.ObjectBuilder()
+            if builder is None:
+                continue
+            builder.event(event, value)
+            if prefix == CASE_PREFIX and event == "end_map":
+                case, builder = builder.value, None
+                if case.get("status") not in FAILED_STATUSES:
+                    continue
+                group = failures.setdefault(case.get("className") or "(unknown)", {"count": 0, "tests": [], "messages": Counter()})
+                group["count"] += 1
+                group["tests"].append(case.get("name"))
+                group["messages"][_error_message(case)] += 1
+    except ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+
+    suites = [
+        {"class": name, "count": group["count"], "tests": group["tests"], "top_errors": group["messages"].most_common(top)}
+        for name, group in sorted(failures.items(), key=lambda item: -item[1]["count"])
+    ]
+    return {
+        "failed": totals["failCount"],
+        "passed": totals["passCount"],
+        "skipped": totals["skipCount"],
+        "failures": suites,
+    }
+
+def format_test_report(report, max_suites=10, max_tests=5):
+    """Render parse_test_report() output as a short text summary for the agent."""
+    lines = [f"Tests: {report['passed']} passed, {report['failed']} failed, {report['skipped']} skipped."]
+    for suite in report["failures"][:max_suites]:
+        tests = ", ".join(str(test) for test in suite["tests"][:max_tests])
+        if len(suite["tests"]) > max_tests:
+            tests += f" (+{len(suite['tests']) - max_tests} more)"
+        lines.append(f"- {suite['class']}: {suite['count']} failed ({tests})")
+        for message, count in suite["top_errors"]:
+            lines.append(f"    {count}x {message}")
+    if len(report["failures"]) > max_suites:
+        lines.append(f"... and {len(report['failures']) - max_suites} more failing classes.")
+    return "\n".join(lines)
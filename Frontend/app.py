@@ -2,11 +2,14 @@ from dotenv import load_dotenv
 import os
 import matplotlib.pyplot as plt
 import streamlit as st
-import os, sys, requests, urllib, re
+import os, sys, re
 sys.path.append("..")
 
 from backend.jenkins_operations import JenkinsOperations
-from backend.auth.auth import authenticate
+from backend.build_analytics import format_health
+from backend.auth.auth import authenticate, verify_token
+from backend.intent_router import IntentRouter
+from backend.streaming import ChatStreamHandler, FakeStreamingLLM
 from langchain.tools import Tool
 from langchain.memory import ConversationBufferMemory
 from langchain.agents import initialize_agent, AgentType
@@ -22,12 +25,30 @@ JENKINS_API_TOKEN = os.getenv("JENKINS_API_TOKEN")
 
 # Jenkins API Instance
 jenkins_api = JenkinsOperations()
+# Receive build events pushed by the Jenkins Notification plugin instead of polling
+if os.getenv("JENKINS_NOTIFY_PORT"):
+    jenkins_api.start_notification_receiver()
 
 # Authentication state
 if "authenticated_user" not in st.session_state:
     st.session_state.authenticated_user = None
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
+if "jobs_cursor" not in st.session_state:
+    st.session_state.jobs_cursor = 0  # offset of the next job page, None when exhausted
+
+# Re-authorize every rerun from the signed session token alone (no Mongo or bcrypt)
+if st.session_state.authenticated_user:
+    session = verify_token(st.session_state.authenticated_user.get("token"))
+    if session["status"] == "failed":
+        st.session_state.authenticated_user = None
+        st.warning(f"⚠️ {session['message']}")
+    else:
+        st.session_state.authenticated_user["role"] = session["role"]
+
+JOBS_PAGE_SIZE = 10
+CONSOLE_TAIL_BYTES = 64 * 1024  # how much console output to render in the chat
+JOB_HEALTH_BUILDS = 200  # build history window used for health analytics
 
 # Function to handle login
 def handle_login():
@@ -39,7 +60,7 @@ def handle_login():
         st.session_state.authenticated_user = None
         st.error(f"❌ {auth_result['message']}")
     else:
-        st.session_state.authenticated_user = {"username": username, "role": auth_result["role"]}
+        st.session_state.authenticated_user = {"username": username, "role": auth_result["role"], "token": auth_result["token"]}
         st.success(f"✅ Welcome, {username} ({auth_result['role']})!")
         st.rerun()
 
@@ -50,15 +71,35 @@ def handle_logout():
     st.rerun()
 
 # Define Tool Functions
+def resolve_job_name(job_name: str, fuzzy=True):
+    """Resolves a job name against the local job index; returns (job_name, error_message)."""
+    resolved = jenkins_api.resolve_job_name(job_name, st.session_state.authenticated_user, fuzzy=fuzzy)
+    if "error" in resolved:
+        suggestions = ", ".join(resolved["suggestions"])
+        return None, f"❌ {resolved['error']}" + (f" Did you mean: {suggestions}?" if suggestions else "")
+    return resolved["job"], None
+
 def list_all_jobs(*args, **kwargs):
     if not st.session_state.authenticated_user:
         return "⚠️ Please log in first."
-    jobs = jenkins_api.get_all_jobs(st.session_state.authenticated_user)
-    if isinstance(jobs, dict) and "jobs" in jobs:
-        job_list = jobs["jobs"][:10]  # Limit display to first 10 jobs
-        formatted_jobs = "\n".join(f"- {job}" for job in job_list)
-        return f"Here are some available Jenkins jobs:\n{formatted_jobs}\n\n(Type 'Show More' for additional jobs.)"
-    return "❌ Failed to fetch job list."
+    st.session_state.jobs_cursor = 0
+    return show_more_jobs()
+
+def show_more_jobs(*args, **kwargs):
+    """Lists the next page of Jenkins jobs, continuing from the session cursor."""
+    if not st.session_state.authenticated_user:
+        return "⚠️ Please log in first."
+    if st.session_state.jobs_cursor is None:
+        return "No more jobs to show."
+
+    page = jenkins_api.get_jobs_page(st.session_state.authenticated_user, st.session_state.jobs_cursor, JOBS_PAGE_SIZE)
+    if "error" in page:
+        return "❌ Failed to fetch job list."
+
+    st.session_state.jobs_cursor = page["next_cursor"]
+    formatted_jobs = "\n".join(f"- {job}" for job in page["jobs"])
+    more = "\n\n(Type 'Show More' for additional jobs.)" if st.session_state.jobs_cursor is not None else ""
+    return f"Here are some available Jenkins jobs:\n{formatted_jobs}{more}"
 
 # def trigger_job(job_name: str):
 #     if not st.session_state.authenticated_user:
@@ -70,19 +111,24 @@ def trigger_job(job_name: str, params=None):
     if not st.session_state.authenticated_user:
         return "⚠️ Please log in first."
 
+    job_name, error = resolve_job_name(job_name, fuzzy=False)
+    if error:
+        return error
+
     params = params or {}
-    formatted_params = urllib.parse.urlencode(params)
-    url = f"{JENKINS_BASE_URL}/job/{urllib.parse.quote(job_name)}/buildWithParameters?{formatted_params}"
+    result = jenkins_api.trigger_job(st.session_state.authenticated_user, job_name, params)
 
-    response = requests.post(url, auth=(JENKINS_USER, JENKINS_API_TOKEN))
-    
-    if response.status_code == 201:
+    if "error" not in result:
         # st.success(f"✅ Job '{job_name}' triggered successfully!")
-        return f"✅ Job '{job_name}' triggered successfully!"
+        queued = f" (queue item #{result['queue_id']})" if "queue_id" in result else ""
+        return f"✅ Job '{job_name}' triggered successfully!{queued}"
     else:
-        return f"❌ Failed to trigger job. Status: {response.status_code}, Response: {response.text}"
+        return f"❌ Failed to trigger job. Response: {result['error']}"
 
 def get_last_build_summary(job_name: str):
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
     data = jenkins_api.get_last_build_summary(job_name)
     if not isinstance(data, dict):
         return "Error: Invalid API response."
@@ -123,6 +169,9 @@ def get_specific_build_summary(query: str):
         return "❌ Invalid input format. Please provide job name and build number, e.g., 'get the build summary of my-job with build number 42'."
 
     job_name, build_number = match.groups()
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
     data = jenkins_api.get_specific_build_summary(job_name, build_number)
 
     if not isinstance(data, dict):
@@ -134,14 +183,22 @@ def get_specific_build_summary(query: str):
 #     return jenkins_api.get_job_health(job_name)
 
 def get_job_health(job_name: str):
-    health_status = jenkins_api.get_job_health(job_name)
-
-    # Convert binary health values to counts
-    healthy_count = sum(1 for status in health_status if status == "Good")
-    unhealthy_count = len(health_status) - healthy_count
+    """Charts success vs. failure over the job's build history and summarizes its health."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+    health = jenkins_api.get_job_analytics(job_name, limit=JOB_HEALTH_BUILDS)
+    if "error" in health:
+        return f"❌ Error fetching build history: {health['error']}"
+    if not health["builds"]:
+        return format_health(job_name, health)
+
+    # Successful vs. unsuccessful completed builds
+    healthy_count = health["results"].get("SUCCESS", 0)
+    unhealthy_count = health["builds"] - healthy_count
 
     # Define labels and sizes
-    labels = ["Healthy", "Unhealthy"]
+    labels = ["Succeeded", "Failed/Unstable"]
     sizes = [healthy_count, unhealthy_count]
     colors = ["#4CAF50", "#FF5733"]  # Green for healthy, Red for unhealthy
 
@@ -172,24 +229,190 @@ def get_job_health(job_name: str):
     # Display chart in Streamlit
     st.pyplot(fig)
 
-    return f"Job '{job_name}' has {healthy_count} healthy runs and {unhealthy_count} unhealthy runs."
+    return format_health(job_name, health)
+
+def get_build_history(job_name: str):
+    """Lists the most recent builds of a job from the local build-history store."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    history = jenkins_api.get_build_history(job_name, limit=10)
+    if "error" in history:
+        return f"❌ Failed to fetch build history: {history['error']}"
+    if not history["builds"]:
+        return f"Job '{job_name}' has no builds."
+    lines = [
+        f"- Build #{build['number']}: {'RUNNING' if build['building'] else build['result']} - {build['url']}"
+        for build in history["builds"]
+    ]
+    return f"Recent builds of '{job_name}':\n" + "\n".join(lines)
+
+def get_test_report(job_name: str):
+    """Summarizes the failing tests of the last build, grouped by test class."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    report = jenkins_api.get_test_report(job_name)
+    if "error" in report:
+        return f"❌ Failed to fetch test report: {report['error']}"
+    return report["summary"]
+
+def list_artifacts(job_name: str):
+    """Lists the artifacts archived by the last build of a job, with download links."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    result = jenkins_api.list_artifacts(job_name)
+    if "error" in result:
+        return f"❌ Failed to list artifacts: {result['error']}"
+    if not result["artifacts"]:
+        return f"Build #{result['build_number']} of '{job_name}' archived no artifacts."
+    return f"Artifacts of '{job_name}' build #{result['build_number']}:\n" + "\n".join(
+        f"- {artifact['relative_path']} - {artifact['url']}" for artifact in result["artifacts"]
+    )
+
+def download_artifact(request: str):
+    """Downloads an artifact of the last build, e.g. 'my-job target/app.jar'."""
+    parts = request.strip().split(maxsplit=1)
+    if len(parts) != 2:
+        return "❌ Please provide the job name and the artifact path, e.g. 'my-job target/app.jar'."
+    job_name, error = resolve_job_name(parts[0])
+    if error:
+        return error
+
+    result = jenkins_api.download_artifact(job_name, parts[1].strip())
+    if "error" in result:
+        return f"❌ Failed to download artifact: {result['error']}"
+    return f"✅ Saved {result['size']} bytes to {result['path']}"
+
+def explain_build_failure(job_name: str):
+    """Returns the failure excerpts found in the console log of the last build."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    result = jenkins_api.get_build_failures(job_name)
+    if "error" in result:
+        return f"❌ Failed to analyze console log: {result['error']}"
+    return result["summary"]
+
+def get_console_log(job_name: str):
+    """Streams the tail of the last build's console output into the chat as it arrives."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    placeholder = st.empty()
+    shown = ""
+    for chunk in jenkins_api.get_console_log(job_name, tail_bytes=CONSOLE_TAIL_BYTES):
+        if "error" in chunk:
+            return f"❌ Failed to fetch console log: {chunk['error']}"
+        shown = (shown + chunk["text"])[-CONSOLE_TAIL_BYTES:]
+        placeholder.code(shown)
+
+    last_lines = "\n".join(shown.splitlines()[-20:])
+    return f"Last lines of the console log for '{job_name}':\n{last_lines}"
+
+def bulk_trigger_jobs(request: str):
+    """Triggers several jobs at once, e.g. 'job-a, job-b with ENV=dev|prod ARCH=x86|arm'.
+
+    Every job runs once per combination of the '|'-separated parameter values.
+    """
+    if not st.session_state.authenticated_user:
+        return "⚠️ Please log in first."
+
+    jobs_part, _, params_part = request.partition(" with ")
+    matrix = {}
+    for pair in params_part.split():
+        key, _, values = pair.partition("=")
+        matrix[key.strip()] = values.split("|")
+    return trigger_job_matrix(jobs_part.split(","), matrix)
+
+def trigger_job_matrix(job_names, matrix):
+    """Triggers each job once per combination of the matrix values and summarizes the outcomes."""
+    if not st.session_state.authenticated_user:
+        return "⚠️ Please log in first."
+
+    resolved = []
+    for job_name in filter(None, (job.strip() for job in job_names)):
+        job_name, error = resolve_job_name(job_name, fuzzy=False)
+        if error:
+            return error
+        resolved.append(job_name)
+
+    results = jenkins_api.trigger_jobs(st.session_state.authenticated_user, resolved, matrix=matrix)["results"]
+    triggered = sum(1 for outcome in results if outcome["status"] == "triggered")
+    lines = [
+        f"- {outcome['job']} {outcome['params'] or ''}: "
+        + (f"queued (item #{outcome['queue_id']})" if outcome["status"] == "triggered" else f"failed ({outcome['error']})")
+        for outcome in results
+    ]
+    return f"Triggered {triggered}/{len(results)} builds:\n" + "\n".join(lines)
+
+def get_triggered_build_status(job_name: str):
+    """Reports the progress of the build most recently triggered for a job."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    status = jenkins_api.get_triggered_build_status(job_name)
+    if "error" in status:
+        return f"⚠️ {status['error']}"
+    if status["state"] == "queued":
+        return f"Job '{job_name}' is waiting in the queue (item #{status['queue_id']})."
+    if status["state"] == "running":
+        return f"Build #{status['build_number']} of '{job_name}' is running - {status['url']}"
+    if status["state"] == "completed":
+        return f"Build #{status['build_number']} of '{job_name}' finished: {status['result']} - {status['url']}"
+    return f"⚠️ Lost track of queue item #{status['queue_id']} for '{job_name}'."
+
+def get_failing_jobs(*args, **kwargs):
+    """Lists jobs whose last build failed or is unstable, from a single status snapshot."""
+    if not st.session_state.authenticated_user:
+        return "⚠️ Please log in first."
+
+    snapshot = jenkins_api.get_status_snapshot(st.session_state.authenticated_user)
+    if "error" in snapshot:
+        return f"❌ Failed to fetch job status: {snapshot['error']}"
+
+    failing = [job for job in snapshot["jobs"] if (job["last_build"] or {}).get("result") in ("FAILURE", "UNSTABLE")]
+    if not failing:
+        return "✅ No failing jobs."
+    return "Failing jobs:\n" + "\n".join(
+        f"- {job['name']}: Build #{job['last_build']['number']} {job['last_build']['result']} - {job['last_build']['url']}"
+        for job in failing
+    )
 
 
 
 # Define Tools
 tools = [
     Tool(name="List All Jobs", func=list_all_jobs, description="Lists available Jenkins jobs.", return_direct=True),
+    Tool(name="Show More Jobs", func=show_more_jobs, description="Lists the next page of Jenkins jobs after List All Jobs.", return_direct=True),
     Tool(name="Trigger Job", func=trigger_job, description="Triggers a Jenkins job."),
+    Tool(name="Bulk Trigger Jobs", func=bulk_trigger_jobs, description="Triggers several Jenkins jobs at once. Input: 'job-a, job-b with KEY=v1|v2'; each job runs once per parameter combination."),
     Tool(name="Get Last Build Summary", func=get_last_build_summary, description="Fetches the last build summary."),
     Tool(name="Get Specific Build Summary", 
          func=get_specific_build_summary, 
          description="Fetches the summary of a specific Jenkins build. Example query: 'get the build summary of job-name with build number 42'."),
     Tool(name="Get Job Health", func=get_job_health, description="Checks the health status of a Jenkins job."),
+    Tool(name="Get Failing Jobs", func=get_failing_jobs, description="Lists jobs whose last build failed or is unstable."),
+    Tool(name="Get Triggered Build Status", func=get_triggered_build_status, description="Reports whether the build triggered for a Jenkins job is queued, running or finished."),
+    Tool(name="Get Build History", func=get_build_history, description="Lists the most recent builds of a Jenkins job with their results."),
+    Tool(name="Get Test Report", func=get_test_report, description="Summarizes the failing tests of the last build of a Jenkins job, grouped by test class."),
+    Tool(name="List Build Artifacts", func=list_artifacts, description="Lists the artifacts archived by the last build of a Jenkins job."),
+    Tool(name="Download Artifact", func=download_artifact, description="Downloads an artifact of the last build. Input: 'job-name relative/path/of/artifact'."),
+    Tool(name="Explain Build Failure", func=explain_build_failure, description="Finds the error lines in the console log of the last build of a Jenkins job."),
+    Tool(name="Get Console Log", func=get_console_log, description="Shows the end of the console output of the last build of a Jenkins job."),
 ]
 
 # Memory and LLM
 memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-llm = Ollama(model="llama3")
+# FAKE_LLM=1 swaps in a canned streaming LLM to exercise the UI without Ollama
+llm = FakeStreamingLLM() if os.getenv("FAKE_LLM") else Ollama(model="llama3")
 
 # Initialize AI Agent
 agent = initialize_agent(
@@ -202,10 +425,38 @@ agent = initialize_agent(
 )
 
 # **Process Query Function**
-def process_query(query: str):
+# Deterministic fast path: fully parseable queries call their tool without the LLM.
+# Kept in the session so hit-rate metrics survive reruns.
+if "router" not in st.session_state:
+    st.session_state.router = IntentRouter({
+        "list_jobs": lambda: list_all_jobs(),
+        "show_more": lambda: show_more_jobs(),
+        "last_build": lambda job: get_last_build_summary(job),
+        "specific_build": lambda job, build: get_specific_build_summary(f"build summary of {job} with build number {build}"),
+        "health": lambda job: get_job_health(job),
+        "failing_jobs": lambda: get_failing_jobs(),
+        "build_status": lambda job: get_triggered_build_status(job) if jenkins_api.tracker.latest(job) else None,
+        "explain_failure": lambda job: explain_build_failure(job),
+        "test_report": lambda job: get_test_report(job),
+        "build_history": lambda job: get_build_history(job),
+        "artifacts": lambda job: list_artifacts(job),
+        "trigger": lambda job: trigger_job(job),
+    }, resolve_job=lambda job: jenkins_api.resolve_job_name(job, st.session_state.authenticated_user, fuzzy=False, strict=True).get("job"))
+
+def process_query(query: str, callbacks=None):
     if not st.session_state.authenticated_user:
         return "⚠️ Please log in first."
-    response = agent.run(query)
+    # Bound the Jenkins time spent on this turn so a slow controller can't stall the agent
+    with jenkins_api.latency_budget():
+        # Fast path first, then answers cached while the jobs they read are unchanged.
+        # Cache entries belong to this login session (its token), since answers depend on its memory.
+        scope = st.session_state.authenticated_user["token"]
+        response = st.session_state.router.route(query) or jenkins_api.response_cache.lookup(query, scope)
+        if response is None:
+            response = jenkins_api.response_cache.compute(query, scope, lambda: agent.run(query, callbacks=callbacks))
+        else:
+            # Keep routed and cached turns in the conversation so follow-ups still have context
+            memory.save_context({"input": query}, {"output": response})
     st.session_state.chat_history.append((query, response))
     return response
 
@@ -227,6 +478,10 @@ with st.sidebar:
     else:
         st.success(f"✅ Logged in as {st.session_state.authenticated_user['username']}")
 
+        # How many questions the fast path answered without the LLM
+        stats = st.session_state.router.stats()
+        st.caption(f"⚡ Answered without the LLM: {stats['routed']} of {stats['routed'] + stats['fallback']} ({stats['hit_rate']:.0%})")
+
         # Logout Button
         if st.button("Logout"):
             handle_logout()
@@ -271,7 +526,7 @@ else:
     # Show input fields only if "Trigger Jobs" is clicked
     if st.session_state.get("show_trigger_input", False):
         job_name = st.text_input("Job Name:", key="job_name_input")
-        raw_params = st.text_area("Parameters (Optional, enter one per line as key=value):", key="params_input")
+        raw_params = st.text_area("Parameters (Optional, enter one per line as key=value, use value1|value2 for a matrix):", key="params_input")
 
         if st.button("Submit Job"):
             # Parse parameters from key=value format
@@ -285,7 +540,12 @@ else:
                     st.error("❌ Invalid parameters format! Use 'key=value', one per line.")
                     params = {}
 
-            response = trigger_job(job_name, params)
+            # Several comma-separated jobs or '|'-separated values fan out as a bulk trigger
+            if "," in job_name or any("|" in value for value in params.values()):
+                matrix = {key: value.split("|") for key, value in params.items()}
+                response = trigger_job_matrix(job_name.split(","), matrix)
+            else:
+                response = trigger_job(job_name, params)
             st.markdown(response)
             st.session_state.messages.append({"role": "assistant", "content": response})
 
@@ -304,8 +564,12 @@ else:
             st.markdown(prompt)
 
         with st.chat_message("assistant"):
-            with st.spinner("🤔 Thinking..."):
-                response = process_query(prompt)
-                st.markdown(response)
+            # Tool progress and the answer render as the agent produces them
+            status = st.empty()
+            answer = st.empty()
+            handler = ChatStreamHandler(lambda text: answer.markdown(text + "▌"), status.caption)
+            response = process_query(prompt, callbacks=[handler])
+            status.empty()
+            answer.markdown(response)
             
             st.session_state.messages.append({"role": "assistant", "content": response})
\ No newline at end of file
@@ -1,6 +1,10 @@
 import streamlit as st
 import requests
+import os, sys
 from langchain_community.llms import Ollama  # Import Ollama from langchain_community
+sys.path.append("..")
+
+from backend.streaming import FakeStreamingLLM
 
 # Streamlit page configuration
 st.set_page_config(page_title="Ollama Chatbot", page_icon="💬", layout="wide")
@@ -69,17 +73,24 @@ class ChatHistory:
 
 # Class to interact with Ollama model
 class OllamaChat:
-    def __init__(self, model="llama3.2"):
+    def __init__(self, model="llama3.2", llm=None):
         self.model = model
+        self.llm = llm or Ollama(model=self.model)
 
     def fetch_response(self, prompt):
         try:
-            ollama_llm = Ollama(model=self.model)
-            response = ollama_llm.invoke(prompt)
+            response = self.llm.invoke(prompt)
             return response
         except Exception as e:
             return f"Error: {e}"
 
+    def stream_response(self, prompt):
+        """Yield the response token by token as the model generates it."""
+        try:
+            yield from self.llm.stream(prompt)
+        except Exception as e:
+            yield f"Error: {e}"
+
 # Display the main title
 st.markdown("<h1 style='text-align: center;'>🤖 Welcome to Ceph CICD bot!</h1>", unsafe_allow_html=True)
 
@@ -105,8 +116,8 @@ for message in current_chat.messages:
     else:
         st.markdown(message["content"], unsafe_allow_html=True)
 
-# Initialize Ollama model
-ollama_chat = OllamaChat()
+# Initialize Ollama model (FAKE_LLM=1 uses a canned streaming LLM instead)
+ollama_chat = OllamaChat(llm=FakeStreamingLLM(responses=["This is a streamed test answer."]) if os.getenv("FAKE_LLM") else None)
 
 # Chat input
 if prompt := st.chat_input("Type your message here..."):
@@ -115,10 +126,9 @@ if prompt := st.chat_input("Type your message here..."):
         st.markdown(prompt)
 
     with st.chat_message("assistant"):
-        with st.spinner("🤔 Thinking..."):
-            response = ollama_chat.fetch_response(prompt)
-            st.markdown(response)
-            current_chat.messages.append({"role": "assistant", "content": response})
+        # Render tokens as they arrive instead of waiting for the whole answer
+        response = st.write_stream(ollama_chat.stream_response(prompt))
+        current_chat.messages.append({"role": "assistant", "content": response})
 
     st.rerun()
 
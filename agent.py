@@ -1,5 +1,4 @@
 import os
-import requests
 from dotenv import load_dotenv
 from langchain.tools import Tool
 from langchain.memory import ConversationBufferMemory
@@ -7,6 +6,7 @@ from langchain_huggingface import HuggingFaceEndpoint
 from langchain.agents import initialize_agent, AgentType
 from huggingface_hub import InferenceClient
 from auth.auth import authenticate
+from backend.intent_router import IntentRouter
 from core.jenkins_operations import JenkinsOperations
 from cicd_operations import CICDOperations
 
@@ -29,67 +29,255 @@ if missing_env_vars:
 
 # Jenkins API Instances
 jenkins_api = JenkinsOperations()
+# Receive build events pushed by the Jenkins Notification plugin instead of polling
+if os.getenv("JENKINS_NOTIFY_PORT"):
+    jenkins_api.start_notification_receiver()
 cicd_ops = CICDOperations()
 
 # Authentication storage
 authenticated_user = None
 
+# Job listing pagination (offset of the next page, None when exhausted)
+JOBS_PAGE_SIZE = 10
+jobs_cursor = 0
+
 # Tool Functions
+def resolve_job_name(job_name: str, fuzzy=True):
+    """Resolves a job name against the local job index; returns (job_name, error_message)."""
+    resolved = jenkins_api.resolve_job_name(job_name, authenticated_user, fuzzy=fuzzy)
+    if "error" in resolved:
+        suggestions = ", ".join(resolved["suggestions"])
+        return None, f"\u274c {resolved['error']}" + (f" Did you mean: {suggestions}?" if suggestions else "")
+    return resolved["job"], None
+
+
 def get_last_build_summary(job_name: str):
-    url = f"{JENKINS_BASE_URL}/job/{job_name}/lastBuild/api/json"
-    response = requests.get(url, auth=(JENKINS_USER, JENKINS_API_TOKEN))
-    
-    if response.status_code == 200:
-        data = response.json()
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+    data = jenkins_api.get_last_build_summary(job_name)
+
+    if "error" not in data:
         return f"Build #{data['number']} Status: {data['result']} - {data['url']}"
-    return f"\u274c Failed to fetch build summary: {response.status_code} - {response.text}"
+    return f"\u274c Failed to fetch build summary: {data['error']}"
 
 
 def get_specific_build_summary(job_name: str, build_number: str):
-    url = f"{JENKINS_BASE_URL}/job/{job_name}/{build_number}/api/json"
-    response = requests.get(url, auth=(JENKINS_USER, JENKINS_API_TOKEN))
-    
-    if response.status_code == 200:
-        data = response.json()
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+    data = jenkins_api.get_specific_build_summary(job_name, build_number)
+
+    if "error" not in data:
         return f"Build #{build_number} Status: {data['result']} - {data['url']}"
-    return f"\u274c Failed to fetch build summary for build #{build_number}: {response.status_code} - {response.text}"
+    return f"\u274c Failed to fetch build summary for build #{build_number}: {data['error']}"
 
 
 def get_job_health(job_name: str):
-    url = f"{JENKINS_BASE_URL}/job/{job_name}/api/json"
-    response = requests.get(url, auth=(JENKINS_USER, JENKINS_API_TOKEN))
-    
-    if response.status_code == 200:
-        data = response.json()
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+    data = jenkins_api.get_job_health(job_name)
+
+    if "error" not in data:
         health_report = data.get("healthReport", [])
         return f"Health Report: {health_report}" if health_report else "\u26a0\ufe0f No health report available."
-    return f"\u274c Failed to fetch job health: {response.status_code} - {response.text}"
+    return f"\u274c Failed to fetch job health: {data['error']}"
 
 
 def trigger_job(job_name: str):
     global authenticated_user
     if not authenticated_user:
         return "\u26a0\ufe0f Authentication required. Please log in."
-    return jenkins_api.trigger_job(authenticated_user, job_name, {})
+    job_name, error = resolve_job_name(job_name, fuzzy=False)
+    if error:
+        return error
+    result = jenkins_api.trigger_job(authenticated_user, job_name, {})
+
+    if "error" not in result:
+        queued = f" (queue item #{result['queue_id']})" if "queue_id" in result else ""
+        return f"\u2705 Job '{job_name}' triggered successfully!{queued}"
+    return f"\u274c Failed to trigger job. Response: {result['error']}"
 
 
 
 def list_all_jobs(*_):
-    """Lists all available Jenkins jobs (User Authentication Applied)."""
+    """Lists the first page of Jenkins jobs (User Authentication Applied)."""
+    global authenticated_user, jobs_cursor
+    if not authenticated_user:
+        return "\u26a0\ufe0f Authentication required. Please log in."
+
+    jobs_cursor = 0
+    return show_more_jobs()
+
+
+def show_more_jobs(*_):
+    """Lists the next page of Jenkins jobs, continuing from the session cursor."""
+    global authenticated_user, jobs_cursor
+    if not authenticated_user:
+        return "\u26a0\ufe0f Authentication required. Please log in."
+    if jobs_cursor is None:
+        return "No more jobs to show."
+
+    page = jenkins_api.get_jobs_page(authenticated_user, jobs_cursor, JOBS_PAGE_SIZE)
+    if "error" in page:
+        return "\u274c Failed to fetch job list."
+
+    jobs_cursor = page["next_cursor"]
+    more = "\n(Type 'Show More' for additional jobs.)" if jobs_cursor is not None else ""
+    return "Here are some available Jenkins jobs:\n" + "\n".join(page["jobs"]) + more
+
+def get_build_history(job_name: str):
+    """Lists the most recent builds of a job from the local build-history store."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    history = jenkins_api.get_build_history(job_name, limit=10)
+    if "error" in history:
+        return f"\u274c Failed to fetch build history: {history['error']}"
+    if not history["builds"]:
+        return f"Job '{job_name}' has no builds."
+    lines = [
+        f"- Build #{build['number']}: {'RUNNING' if build['building'] else build['result']} - {build['url']}"
+        for build in history["builds"]
+    ]
+    return f"Recent builds of '{job_name}':\n" + "\n".join(lines)
+
+def get_test_report(job_name: str):
+    """Summarizes the failing tests of the last build, grouped by test class."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    report = jenkins_api.get_test_report(job_name)
+    if "error" in report:
+        return f"\u274c Failed to fetch test report: {report['error']}"
+    return report["summary"]
+
+def list_artifacts(job_name: str):
+    """Lists the artifacts archived by the last build of a job, with download links."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    result = jenkins_api.list_artifacts(job_name)
+    if "error" in result:
+        return f"\u274c Failed to list artifacts: {result['error']}"
+    if not result["artifacts"]:
+        return f"Build #{result['build_number']} of '{job_name}' archived no artifacts."
+    return f"Artifacts of '{job_name}' build #{result['build_number']}:\n" + "\n".join(
+        f"- {artifact['relative_path']} - {artifact['url']}" for artifact in result["artifacts"]
+    )
+
+def download_artifact(request: str):
+    """Downloads an artifact of the last build, e.g. 'my-job target/app.jar'."""
+    parts = request.strip().split(maxsplit=1)
+    if len(parts) != 2:
+        return "\u274c Please provide the job name and the artifact path, e.g. 'my-job target/app.jar'."
+    job_name, error = resolve_job_name(parts[0])
+    if error:
+        return error
+
+    result = jenkins_api.download_artifact(job_name, parts[1].strip())
+    if "error" in result:
+        return f"\u274c Failed to download artifact: {result['error']}"
+    return f"\u2705 Saved {result['size']} bytes to {result['path']}"
+
+def explain_build_failure(job_name: str):
+    """Returns the failure excerpts found in the console log of the last build."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    result = jenkins_api.get_build_failures(job_name)
+    if "error" in result:
+        return f"\u274c Failed to analyze console log: {result['error']}"
+    return result["summary"]
+
+def bulk_trigger_jobs(request: str):
+    """Triggers several jobs at once, e.g. 'job-a, job-b with ENV=dev|prod ARCH=x86|arm'.
+
+    Every job runs once per combination of the '|'-separated parameter values.
+    """
     global authenticated_user
     if not authenticated_user:
         return "\u26a0\ufe0f Authentication required. Please log in."
 
-    return jenkins_api.get_all_jobs(authenticated_user)
+    jobs_part, _, params_part = request.partition(" with ")
+    matrix = {}
+    for pair in params_part.split():
+        key, _, values = pair.partition("=")
+        matrix[key.strip()] = values.split("|")
+
+    job_names = []
+    for job_name in filter(None, (job.strip() for job in jobs_part.split(","))):
+        job_name, error = resolve_job_name(job_name, fuzzy=False)
+        if error:
+            return error
+        job_names.append(job_name)
+
+    results = jenkins_api.trigger_jobs(authenticated_user, job_names, matrix=matrix)["results"]
+    triggered = sum(1 for outcome in results if outcome["status"] == "triggered")
+    lines = [
+        f"- {outcome['job']} {outcome['params'] or ''}: "
+        + (f"queued (item #{outcome['queue_id']})" if outcome["status"] == "triggered" else f"failed ({outcome['error']})")
+        for outcome in results
+    ]
+    return f"Triggered {triggered}/{len(results)} builds:\n" + "\n".join(lines)
+
+def get_triggered_build_status(job_name: str):
+    """Reports the progress of the build most recently triggered for a job."""
+    job_name, error = resolve_job_name(job_name)
+    if error:
+        return error
+
+    status = jenkins_api.get_triggered_build_status(job_name)
+    if "error" in status:
+        return f"\u26a0\ufe0f {status['error']}"
+    if status["state"] == "queued":
+        return f"Job '{job_name}' is waiting in the queue (item #{status['queue_id']})."
+    if status["state"] == "running":
+        return f"Build #{status['build_number']} of '{job_name}' is running - {status['url']}"
+    if status["state"] == "completed":
+        return f"Build #{status['build_number']} of '{job_name}' finished: {status['result']} - {status['url']}"
+    return f"\u26a0\ufe0f Lost track of queue item #{status['queue_id']} for '{job_name}'."
+
+def get_failing_jobs(*_):
+    """Lists jobs whose last build failed or is unstable, from a single status snapshot."""
+    global authenticated_user
+    if not authenticated_user:
+        return "\u26a0\ufe0f Authentication required. Please log in."
+
+    snapshot = jenkins_api.get_status_snapshot(authenticated_user)
+    if "error" in snapshot:
+        return f"\u274c Failed to fetch job status: {snapshot['error']}"
+
+    failing = [job for job in snapshot["jobs"] if (job["last_build"] or {}).get("result") in ("FAILURE", "UNSTABLE")]
+    if not failing:
+        return "\u2705 No failing jobs."
+    return "Failing jobs:\n" + "\n".join(
+        f"- {job['name']}: Build #{job['last_build']['number']} {job['last_build']['result']} - {job['last_build']['url']}"
+        for job in failing
+    )
 
 
 # Define Tools
 tools = [
     Tool(name="List All Jobs", func=list_all_jobs, description="Lists all available Jenkins jobs."),
+    Tool(name="Show More Jobs", func=show_more_jobs, description="Lists the next page of Jenkins jobs after List All Jobs."),
     Tool(name="Trigger Job", func=trigger_job, description="Triggers a Jenkins job."),
+    Tool(name="Bulk Trigger Jobs", func=bulk_trigger_jobs, description="Triggers several Jenkins jobs at once. Input: 'job-a, job-b with KEY=v1|v2'; each job runs once per parameter combination."),
     Tool(name="Get Last Build Summary", func=get_last_build_summary, description="Fetches the last build summary of a Jenkins job."),
     Tool(name="Get Specific Build Summary", func=get_specific_build_summary, description="Fetches a specific build summary of a Jenkins job."),
     Tool(name="Get Job Health", func=get_job_health, description="Checks the health status of a Jenkins job."),
+    Tool(name="Get Failing Jobs", func=get_failing_jobs, description="Lists jobs whose last build failed or is unstable."),
+    Tool(name="Get Triggered Build Status", func=get_triggered_build_status, description="Reports whether the build triggered for a Jenkins job is queued, running or finished."),
+    Tool(name="Get Build History", func=get_build_history, description="Lists the most recent builds of a Jenkins job with their results."),
+    Tool(name="Get Test Report", func=get_test_report, description="Summarizes the failing tests of the last build of a Jenkins job, grouped by test class."),
+    Tool(name="List Build Artifacts", func=list_artifacts, description="Lists the artifacts archived by the last build of a Jenkins job."),
+    Tool(name="Download Artifact", func=download_artifact, description="Downloads an artifact of the last build. Input: 'job-name relative/path/of/artifact'."),
+    Tool(name="Explain Build Failure", func=explain_build_failure, description="Finds the error lines in the console log of the last build of a Jenkins job."),
 ]
 
 # Memory for Conversation
@@ -118,11 +306,38 @@ agent = initialize_agent(
     handle_parsing_errors=True
 )
 
+# Deterministic fast path: fully parseable queries call their tool without the LLM
+router = IntentRouter({
+    "list_jobs": lambda: list_all_jobs(),
+    "show_more": lambda: show_more_jobs(),
+    "last_build": lambda job: get_last_build_summary(job),
+    "specific_build": lambda job, build: get_specific_build_summary(job, build),
+    "health": lambda job: get_job_health(job),
+    "failing_jobs": lambda: get_failing_jobs(),
+    "build_status": lambda job: get_triggered_build_status(job) if jenkins_api.tracker.latest(job) else None,
+    "explain_failure": lambda job: explain_build_failure(job),
+    "test_report": lambda job: get_test_report(job),
+    "build_history": lambda job: get_build_history(job),
+    "artifacts": lambda job: list_artifacts(job),
+    "trigger": lambda job: trigger_job(job),
+}, resolve_job=lambda job: jenkins_api.resolve_job_name(job, authenticated_user, fuzzy=False, strict=True).get("job"))
+
 def process_query(query: str):
     global authenticated_user
     if not authenticated_user:
         return "\u26a0\ufe0f Please authenticate first."
-    return agent.run(query)
+    # Bound the Jenkins time spent on this turn so a slow controller can't stall the agent
+    with jenkins_api.latency_budget():
+        # Fast path first, then answers cached while the jobs they read are unchanged.
+        # Cache entries belong to this login session (its token), since answers depend on its memory.
+        scope = authenticated_user["token"]
+        response = router.route(query) or jenkins_api.response_cache.lookup(query, scope)
+        if response is None:
+            response = jenkins_api.response_cache.compute(query, scope, lambda: agent.run(query))
+        else:
+            # Keep routed and cached turns in the conversation so follow-ups still have context
+            memory.save_context({"input": query}, {"output": response})
+    return response
 
 
 def main():
@@ -137,7 +352,7 @@ def main():
         print(f"\u274c {auth_result['message']}")
         return
 
-    authenticated_user = {"username": username, "role": auth_result["role"]}
+    authenticated_user = {"username": username, "role": auth_result["role"], "token": auth_result["token"]}
     print(f"\n✅ Welcome, {username}! You are logged in as '{auth_result['role']}'.")
 
     print("\n🔹 Jenkins AI Agent is ready. Type 'exit' to quit.\n")
@@ -145,6 +360,8 @@ def main():
     while True:
         query = input("\n💬 Enter command: ").strip()
         if query.lower() == "exit":
+            stats = router.stats()
+            print(f"⚡ {stats['routed']} of {stats['routed'] + stats['fallback']} queries answered without the LLM ({stats['hit_rate']:.0%}).")
             print("👋 Exiting agent...")
             break
         
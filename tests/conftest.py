@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Same import roots the apps use: the repo root for `backend.*`, Backend/ for its bare imports
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "Backend")]
+
+import pytest
+
+@pytest.fixture
+def jenkins(monkeypatch, tmp_path):
+    """A JenkinsOperations with fresh shared state and a temporary history store."""
+    from backend.jenkins_operations import JenkinsOperations
+    from backend.job_index import JobIndex
+
+    monkeypatch.setenv("JENKINS_USER", "user")
+    monkeypatch.setenv("JENKINS_API_TOKEN", "token")
+    monkeypatch.setenv("JENKINS_HISTORY_DB", str(tmp_path / "history.db"))
+    monkeypatch.setenv("JENKINS_DOWNLOAD_DIR", str(tmp_path / "downloads"))
+    for name in ("_session", "_cache", "_tracker", "_crumb", "_breaker", "_store", "_receiver", "_policy",
+                 "_response_cache", "_snapshot_states", "_job_index_refreshed"):
+        monkeypatch.setattr(JenkinsOperations, name, None)
+    monkeypatch.setattr(JenkinsOperations, "_job_index", JobIndex())
+    return JenkinsOperations()
@@ -0,0 +1,40 @@
+from urllib.parse import unquote
+
+def builds(newest, count):
+    return [{"number": n, "result": "SUCCESS", "url": f"/job/app/{n}/", "building": False, "timestamp": n, "duration": 1}
+            for n in range(newest, max(newest - count, 0), -1)]
+
+def serve(monkeypatch, jenkins, newest):
+    """Answer build_history requests from a job whose newest build is `newest`, recording each range."""
+    ranges = []
+
+    def get_request(url):
+        start, end = unquote(url).rsplit("{", 1)[1].rstrip("}").split(",")
+        ranges.append((int(start), int(end)))
+        return {"allBuilds": builds(newest - int(start), int(end) - int(start))}
+
+    monkeypatch.setattr(jenkins, "_get_request", get_request)
+    return ranges
+
+def test_first_sync_backfills_from_a_single_request(jenkins, monkeypatch):
+    ranges = serve(monkeypatch, jenkins, newest=300)
+
+    assert jenkins.sync_build_history("app") == {"synced": 300}
+    assert ranges == [(0, jenkins.history_limit)]
+
+def test_limit_bounds_the_first_sync_and_is_capped_by_the_history_limit(jenkins, monkeypatch):
+    monkeypatch.setattr(jenkins, "history_limit", 100)
+    ranges = serve(monkeypatch, jenkins, newest=300)
+
+    assert jenkins.sync_build_history("app", limit=40) == {"synced": 40}
+    assert jenkins.sync_build_history("lib", limit=500) == {"synced": 100}
+    assert ranges == [(0, 40), (0, 100)]
+
+def test_later_syncs_page_and_stop_at_the_sync_point(jenkins, monkeypatch):
+    serve(monkeypatch, jenkins, newest=300)
+    jenkins.sync_build_history("app")
+    jenkins.cache.clear()
+
+    ranges = serve(monkeypatch, jenkins, newest=303)
+    assert jenkins.sync_build_history("app") == {"synced": 3}
+    assert ranges == [(0, jenkins.history_page_size)]
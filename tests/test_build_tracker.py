@@ -0,0 +1,49 @@
+import re
+
+from backend.build_tracker import BuildHandle, BuildTracker
+
+def test_handles_outside_the_builds_window_resolve_through_the_queue_item(jenkins, monkeypatch):
+    # 60 triggered builds of one job: queue ids 1000..1059 became builds 1..60
+    requests = []
+    def get(url):
+        requests.append(url)
+        if "/queue/api/json" in url:
+            return {"items": []}
+        match = re.search(r"/queue/item/(\d+)/", url)
+        if match:
+            return {"executable": {"number": int(match.group(1)) - 999, "url": "u"}}
+        match = re.search(r"/job/app/(\d+)/api/json", url)
+        if match:
+            return {"number": int(match.group(1)), "result": "SUCCESS", "building": False, "url": "u"}
+        start, end = map(int, re.search(r"\{(\d+),(\d+)\}", url).groups())
+        return {"builds": [
+            {"number": n, "result": "SUCCESS", "building": False, "url": "u", "queueId": n + 999}
+            for n in range(60, 0, -1)
+        ][start:end]}
+    monkeypatch.setattr(jenkins, "_get_request", get)
+
+    tracker = BuildTracker(jenkins, window=5)
+    handles = [BuildHandle(queue_id, "app") for queue_id in range(1000, 1060)]
+    tracker.poll(handles)
+
+    assert all(handle.state == "completed" for handle in handles)
+    assert [handle.build_number for handle in handles] == list(range(1, 61))
+    # The window covered every handle, so no per-build fallback was needed
+    assert not any("/queue/item/" in url for url in requests)
+
+def test_handle_beyond_the_window_uses_its_executable(jenkins, monkeypatch):
+    def get(url):
+        if "/queue/api/json" in url:
+            return {"items": []}
+        if "/queue/item/7/" in url:
+            return {"executable": {"number": 3, "url": "u"}}
+        if "/job/app/3/api/json" in url:
+            return {"number": 3, "result": "FAILURE", "building": False, "url": "u"}
+        return {"builds": [{"number": 50, "result": "SUCCESS", "building": False, "url": "u", "queueId": 99}]}
+    monkeypatch.setattr(jenkins, "_get_request", get)
+
+    tracker = BuildTracker(jenkins)
+    handle = BuildHandle(7, "app")
+    tracker.poll([handle])
+
+    assert (handle.state, handle.build_number, handle.result) == ("completed", 3, "FAILURE")
@@ -0,0 +1,19 @@
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from backend.auth import database
+
+@pytest.fixture
+def client():
+    client = mongomock.MongoClient()
+    database.set_client(client)
+    yield client
+    database.set_client(None)
+
+def test_duplicate_usernames_do_not_break_lookups(client):
+    users = client[database.DB_NAME]["users"]
+    users.insert_many([{"username": "dev", "role": "admin"}, {"username": "dev", "role": "default"}])
+
+    assert database.get_user("dev")["username"] == "dev"
+    assert database.get_users_collection() is database.get_users_collection()
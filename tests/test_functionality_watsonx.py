@@ -0,0 +1,77 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("langchain")
+
+from backend.streaming import FakeStreamingLLM
+
+@pytest.fixture
+def watsonx(monkeypatch, tmp_path):
+    """Import the watsonx app with the IBM SDK replaced by an offline LLM."""
+    foundation_models = types.ModuleType("ibm_watson_machine_learning.foundation_models")
+    foundation_models.Model = lambda **kwargs: object()
+    metanames = types.ModuleType("ibm_watson_machine_learning.metanames")
+    metanames.GenTextParamsMetaNames = types.SimpleNamespace(MAX_NEW_TOKENS="max_new_tokens")
+    extension = types.ModuleType("ibm_watson_machine_learning.foundation_models.extensions.langchain")
+    extension.WatsonxLLM = lambda model: FakeStreamingLLM(delay=0)
+    for name, module in {
+        "ibm_watson_machine_learning": types.ModuleType("ibm_watson_machine_learning"),
+        "ibm_watson_machine_learning.foundation_models": foundation_models,
+        "ibm_watson_machine_learning.metanames": metanames,
+        "ibm_watson_machine_learning.foundation_models.extensions": types.ModuleType("extensions"),
+        "ibm_watson_machine_learning.foundation_models.extensions.langchain": extension,
+    }.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.setenv("WATSONX_API_KEY", "test-key")
+    monkeypatch.setenv("JENKINS_USER", "user")
+    monkeypatch.setenv("JENKINS_API_TOKEN", "token")
+    monkeypatch.setenv("JENKINS_HISTORY_DB", str(tmp_path / "history.db"))
+    monkeypatch.delenv("JENKINS_NOTIFY_PORT", raising=False)
+
+    import streamlit as st
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+    sys.modules.pop("functionality_watsonx", None)
+    app = importlib.import_module("functionality_watsonx")
+    monkeypatch.setattr(app.jenkins_api, "_get_request", lambda url: {"error": "Jenkins is offline in tests"})
+    from auth.auth import issue_token
+    app.st.session_state.authenticated_user = {"username": "dev", "role": "admin", "token": issue_token("dev", "admin")}
+    app.st.session_state.chat_history = []
+    monkeypatch.setattr(app.jenkins_api, "resolve_job_name", lambda job_name, user=None, **kwargs: {"job": job_name})
+    return app
+
+def test_routed_health_query_is_saved_as_text(watsonx, monkeypatch):
+    monkeypatch.setattr(watsonx.jenkins_api, "get_job_health", lambda job_name: {
+        "healthReport": [{"description": "Build stability: 1 out of the last 5 builds failed.", "score": 80}]
+    })
+
+    response = watsonx.process_query("health of service-a")
+
+    assert response.startswith("Health Report:")
+    assert watsonx.memory.load_memory_variables({})["chat_history"][-1].content == response
+
+def test_health_and_build_summary_report_errors(watsonx, monkeypatch):
+    monkeypatch.setattr(watsonx.jenkins_api, "get_job_health", lambda job_name: {"error": "404 Not Found"})
+    monkeypatch.setattr(watsonx.jenkins_api, "get_specific_build_summary", lambda job_name, number: {"error": "404 Not Found"})
+
+    assert watsonx.get_job_health("service-a") == "❌ Failed to fetch job health: 404 Not Found"
+    assert watsonx.get_specific_build_summary("service-a", "7").startswith("❌ Failed to fetch build summary for build #7")
+
+def test_status_of_an_untracked_build_goes_to_the_agent(watsonx):
+    response = watsonx.process_query("is service-a done")
+
+    assert response == "This is a streamed test answer."
+    assert watsonx.st.session_state.router.stats()["fallback"] == 1
+
+def test_routing_waits_for_the_job_index(watsonx, monkeypatch):
+    monkeypatch.setattr(watsonx.jenkins_api, "resolve_job_name", lambda job_name, user=None, strict=False, **kwargs: (
+        {"error": "The job index is not available.", "suggestions": []} if strict else {"job": job_name}
+    ))
+    monkeypatch.setattr(watsonx.jenkins_api, "trigger_job", lambda *args: pytest.fail("trigger was routed"))
+
+    assert watsonx.process_query("trigger job service-a") == "This is a streamed test answer."
@@ -0,0 +1,44 @@
+import pytest
+
+from backend.intent_router import INTENT_PATTERNS, IntentRouter
+
+JOBS = {"service-a": "service-a", "team/app": "team/app"}
+
+@pytest.fixture
+def router():
+    handlers = {name: (lambda name=name, **arguments: (name, arguments)) for name in INTENT_PATTERNS}
+    return IntentRouter(handlers, resolve_job=JOBS.get)
+
+@pytest.mark.parametrize("query", [
+    "is my build done?",
+    "is the job finished",
+    "why did it fail",
+    "start the build",
+    "start job now",
+    "trigger job please",
+    "show me build 5",
+    "get it build 3",
+    "trigger service-a",
+])
+def test_loose_phrasings_fall_back_to_the_agent(router, query):
+    assert router.route(query) is None
+
+@pytest.mark.parametrize("query, expected", [
+    ("trigger job service-a", ("trigger", {"job": "service-a"})),
+    ("start job service-a now", ("trigger", {"job": "service-a"})),
+    ("show service-a build 5", ("specific_build", {"job": "service-a", "build": "5"})),
+    ("why did team/app fail?", ("explain_failure", {"job": "team/app"})),
+    ("list jobs", ("list_jobs", {})),
+])
+def test_explicit_queries_are_routed(router, query, expected):
+    assert router.route(query) == expected
+
+def test_unresolved_job_names_fall_back_to_the_agent(router):
+    assert router.route("last build of unknown-job") is None
+    assert router.stats()["fallback"] == 1
+
+def test_empty_job_index_does_not_pass_names_through(jenkins, monkeypatch):
+    monkeypatch.setattr(jenkins, "get_all_jobs_recursive", lambda user: {"jobs": [], "complete": False})
+
+    assert jenkins.resolve_job_name("service-a") == {"job": "service-a"}
+    assert "error" in jenkins.resolve_job_name("service-a", strict=True)
@@ -0,0 +1,43 @@
+import pytest
+import requests
+
+from backend.notification_receiver import NotificationReceiver, parse_event, send_fake_event
+
+@pytest.fixture
+def receiver(jenkins):
+    receiver = NotificationReceiver(jenkins, port=0).start()
+    yield receiver
+    receiver.stop()
+
+def url(receiver):
+    return f"http://127.0.0.1:{receiver.port}/"
+
+@pytest.mark.parametrize("payload", [
+    [1, 2],
+    "event",
+    {"name": "app", "url": "job/app/", "build": [1]},
+    {"name": "app", "url": "job/app/", "build": {"number": "five", "phase": "COMPLETED"}},
+    {"name": 5, "url": ["job"], "build": {"number": 1, "phase": "COMPLETED"}},
+])
+def test_malformed_payloads_get_a_400(receiver, payload):
+    response = requests.post(url(receiver), json=payload, timeout=5)
+
+    assert response.status_code == 400
+    assert "error" in response.json()
+    assert receiver.events == 0
+
+def test_invalid_json_gets_a_400(receiver):
+    response = requests.post(url(receiver), data=b"{not json", timeout=5)
+
+    assert response.status_code == 400
+
+def test_build_numbers_are_stored_as_integers(receiver, jenkins):
+    payload = {"name": "app", "url": "job/app/", "build": {"number": "5", "phase": "COMPLETED", "status": "SUCCESS"}}
+    assert requests.post(url(receiver), json=payload, timeout=5).json() == {"applied": True}
+
+    assert jenkins.store.get("app", 5)["number"] == 5
+    assert parse_event(payload)[1]["number"] == 5
+
+def test_fake_event_round_trip(receiver, jenkins):
+    assert send_fake_event(url(receiver), "team/app", 7) == {"applied": True}
+    assert jenkins.store.get("team/app", 7)["result"] == "SUCCESS"
@@ -0,0 +1,88 @@
+import io
+
+import requests
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=b"", headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = io.BytesIO(body)
+        self._body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error")
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self._body), chunk_size):
+            yield self._body[i:i + chunk_size]
+
+class FakeSession:
+    """Replays queued responses (or raises queued exceptions) and records the calls."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+def test_streaming_tools_fail_fast_while_the_breaker_is_open(jenkins, monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(jenkins, "session", session)
+    for _ in range(jenkins.breaker.failure_threshold):
+        jenkins.breaker.record_failure()
+
+    assert "unavailable" in next(jenkins.get_console_log("app", 5))["error"]
+    assert "unavailable" in jenkins.get_test_report("app", 5)["error"]
+    assert "unavailable" in jenkins.download_artifact("app", "target/app.jar", build_number=5)["error"]
+    assert session.calls == []
+
+def test_streaming_tools_stop_when_the_latency_budget_is_spent(jenkins, monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(jenkins, "session", session)
+
+    with jenkins.latency_budget(0):
+        assert "budget" in next(jenkins.get_console_log("app", 5))["error"]
+        assert "budget" in jenkins.get_test_report("app", 5)["error"]
+    assert session.calls == []
+
+def test_test_report_retries_server_errors_and_records_the_outcome(jenkins, monkeypatch):
+    monkeypatch.setattr("backend.jenkins_operations.backoff_delay", lambda attempt: 0)
+    session = FakeSession(
+        FakeResponse(503),
+        requests.exceptions.ConnectionError("refused"),
+        FakeResponse(200, b'{"suites": []}'),
+    )
+    monkeypatch.setattr(jenkins, "session", session)
+
+    report = jenkins.get_test_report("app", 5)
+
+    assert "error" not in report
+    assert len(session.calls) == 3
+    assert all(kwargs["stream"] and kwargs["timeout"] for _, kwargs in session.calls)
+    assert jenkins.breaker.state == "closed"
+
+def test_console_log_failures_count_towards_the_breaker(jenkins, monkeypatch):
+    monkeypatch.setattr("backend.jenkins_operations.backoff_delay", lambda attempt: 0)
+    monkeypatch.setattr(jenkins, "retries", 0)
+    session = FakeSession(*[requests.exceptions.Timeout("slow")] * jenkins.breaker.failure_threshold)
+    monkeypatch.setattr(jenkins, "session", session)
+
+    for _ in range(jenkins.breaker.failure_threshold):
+        assert "error" in next(jenkins.get_console_log("app", 5))
+
+    assert jenkins.breaker.state == "open"
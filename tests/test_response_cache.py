@@ -0,0 +1,52 @@
+from backend.response_cache import ResponseCache, note_read
+
+def snapshot(**last_builds):
+    return {"jobs": [{"name": name, "color": "blue", "lastBuild": {"number": number}} for name, number in last_builds.items()]}
+
+def test_answer_is_not_stored_when_its_job_builds_meanwhile(jenkins, monkeypatch):
+    snapshots = iter([snapshot(app=5), snapshot(app=6), snapshot(app=6)])
+    monkeypatch.setattr(jenkins, "_get_request", lambda url: next(snapshots) if "jobs[" in url else {"healthReport": []})
+    monkeypatch.setitem(jenkins.cache_ttl, "status_snapshot", 0)
+    cache = jenkins.response_cache
+
+    def answer():
+        jenkins.get_job_health("app")
+        return "app is healthy"
+
+    assert cache.compute("health of app", "session", answer) == "app is healthy"
+    assert cache.lookup("health of app", "session") is None
+
+def test_a_new_snapshot_drops_the_changed_jobs_cached_responses(jenkins, monkeypatch):
+    snapshots = iter([snapshot(app=5, lib=1), snapshot(app=6, lib=1)])
+    monkeypatch.setattr(jenkins, "_get_request", lambda url: next(snapshots) if "jobs[" in url else {"healthReport": []})
+    monkeypatch.setitem(jenkins.cache_ttl, "status_snapshot", 0)
+    jenkins.state_fingerprint(None)
+    jenkins.get_job_health("app")
+    jenkins.get_job_health("lib")
+
+    jenkins.state_fingerprint(None)
+
+    assert jenkins.cache.get(jenkins._cache_key("job_health", job_name="app")) is None
+    assert jenkins.cache.get(jenkins._cache_key("job_health", job_name="lib")) is not None
+
+def test_stable_answers_are_served_until_their_job_changes():
+    state = {"app": 5}
+    cache = ResponseCache(lambda dependencies: tuple(sorted(state.items())))
+
+    def answer():
+        note_read("app")
+        return "Build #5"
+
+    cache.compute("last build of app", "session", answer)
+    assert cache.lookup("last build of app", "session") == "Build #5"
+    assert cache.lookup("last build of app", "other-session") is None
+
+    state["app"] = 6
+    assert cache.lookup("last build of app", "session") is None
+
+def test_artifact_downloads_are_never_cached(jenkins):
+    cache = ResponseCache(lambda dependencies: ())
+
+    cache.compute("download app target/app.jar", "session", lambda: jenkins.download_artifact("app", "../escape"))
+
+    assert cache.lookup("download app target/app.jar", "session") is None